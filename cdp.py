@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Chrome DevTools Protocol helpers for remote Chrome 97 sessions
+"""
+
+# selenium is imported inside each helper so scripts that only need
+# WEBDRIVER_URL or the hub's status start fast (see chrome97.py startup-bench)
+import json
+
+WEBDRIVER_URL = "http://localhost:4444/wd/hub"
+
+
+def remote_connection(webdriver_url=WEBDRIVER_URL):
+    """Command executor that knows chromedriver's goog/cdp/execute endpoint"""
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+    return ChromiumRemoteConnection(webdriver_url, vendor_prefix="goog", browser_name="chrome")
+
+
+def create_remote_driver(options, webdriver_url=WEBDRIVER_URL):
+    """Create a Remote driver that can also send CDP commands through the hub"""
+    from selenium import webdriver
+
+    return webdriver.Remote(
+        command_executor=remote_connection(webdriver_url),
+        options=options
+    )
+
+
+def execute_cdp(driver, cmd, params=None):
+    """Run a CDP command in the session via chromedriver's goog/cdp/execute endpoint"""
+    response = driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})
+    return response["value"]
+
+
+def attach_to_session(session_id, webdriver_url=WEBDRIVER_URL):
+    """Get a driver for an already-running session (e.g. one owned by run_forever.py)
+
+    The returned driver must not be quit - that would end the other process's session.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    class AttachedRemote(webdriver.Remote):
+        def start_session(self, capabilities):
+            # Reuse the existing session instead of asking the hub for a new one
+            self.session_id = session_id
+            self.caps = {}
+
+    return AttachedRemote(
+        command_executor=remote_connection(webdriver_url),
+        options=Options()
+    )
+
+
+def hub_status(webdriver_url=WEBDRIVER_URL, timeout=3):
+    """Fetch the hub's /status with the standard library only"""
+    from urllib.request import urlopen
+
+    with urlopen(f"{webdriver_url}/status", timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8")).get("value", {})
+
+
+def free_slots(webdriver_url=WEBDRIVER_URL):
+    """(free, total) session slots across the hub's nodes"""
+    slots = [slot for node in hub_status(webdriver_url).get("nodes", []) for slot in node.get("slots", [])]
+    return sum(1 for slot in slots if not slot.get("session")), len(slots)
+
+
+def list_hub_sessions(webdriver_url=WEBDRIVER_URL):
+    """Return (session id, browser version) for every session the hub reports"""
+    sessions = []
+    for node in hub_status(webdriver_url, timeout=10).get("nodes", []):
+        for slot in node.get("slots", []):
+            session = slot.get("session")
+            if session:
+                version = session.get("capabilities", {}).get("browserVersion", "?")
+                sessions.append((session["sessionId"], version))
+    return sessions
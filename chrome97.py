@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Chrome 97 Simulator CLI - one fast-starting entry point for every harness script
+"""
+
+# Keep module-level imports to the standard library: `--help`, `options` and
+# `status` must not pay for selenium/requests. Script commands import their
+# module (and its dependencies) only when they run.
+import argparse
+import json
+import sys
+import os
+
+from cdp import WEBDRIVER_URL, hub_status
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Quick commands may add at most this many milliseconds on top of bare
+# interpreter startup (see startup-bench)
+STARTUP_BUDGET_MS = 40
+HEAVY_MODULES = ("selenium", "requests", "urllib3", "trio")
+
+SCRIPT_COMMANDS = {
+    "connect": ("connect_to_frontend.py", "Interactive connection to your app"),
+    "session-2h": ("connect_2hours.py", "2-hour timed session"),
+    "session-24h": ("connect_24hours.py", "24-hour session with auto-reconnect"),
+    "forever": ("run_forever.py", "Infinite session with auto-recovery"),
+    "test": ("selenium_test.py", "Basic Selenium functionality test"),
+    "connectivity": ("test_connectivity.py", "Test connection to localhost"),
+    "serve": ("test_server.py", "Simple test server for demos"),
+    "run": ("parallel_runner.py", "Run test functions in parallel on reused sessions"),
+    "capture": ("network_capture.py", "Capture network activity to a HAR file"),
+    "network-profiles": ("network_profiles.py", "List network blocking/throttling profiles"),
+    "warm": ("warm_profile.py", "Benchmark/manage warm browser profiles"),
+    "profile": ("profile_session.py", "CPU-profile the frontend in a live session"),
+    "watch": ("hot_reload.py", "Refresh a live session when build output changes"),
+    "density-bench": ("density_bench.py", "Compare VNC and headless nodes (sessions, memory, load time)"),
+    "view": ("screencast_viewer.py", "Low-bandwidth viewport stream of a live session"),
+}
+
+
+def run_script(command, args):
+    """Run a harness script as __main__ with the remaining arguments"""
+    import runpy
+
+    script = SCRIPT_COMMANDS[command][0]
+    sys.argv = [script] + args
+    runpy.run_path(os.path.join(HERE, script), run_name="__main__")
+
+
+def print_instances(instances):
+    from status_board import format_uptime
+
+    print(f"♾️  Local instances: {len(instances)}")
+    for i in instances:
+        icon = {"connected": "✅", "stopped": "🔚", "stale": "💀"}.get(i["state"], "🔄")
+        probe = f"{i['last_probe_ms']:.0f}ms" if i["last_probe_ms"] is not None else "-"
+        print(f"   {icon} :{i['port']} pid {i['pid']} {i['state']}, up {format_uptime(i['uptime_s'])}, "
+              f"probe {probe}, recoveries {i['recoveries']}, failed checks {i['health_failures']}")
+        if i["session_id"]:
+            print(f"      🔗 {i['session_id']}  📍 {i['url']}")
+
+
+def cmd_status(args):
+    # The status board is a local shared-memory file: reading it never blocks on
+    # WebDriver, so --local answers instantly even when the hub is down
+    from status_board import read_board
+
+    instances = read_board()
+    if args.local:
+        if args.json:
+            print(json.dumps({"instances": instances}))
+        else:
+            print_instances(instances)
+        return 0
+
+    try:
+        status = hub_status(args.webdriver_url)
+    except Exception as e:
+        if args.json:
+            print(json.dumps({"ready": False, "error": str(e), "instances": instances}))
+        else:
+            print(f"❌ WebDriver unreachable at {args.webdriver_url}: {e}")
+            print("Start it with: docker-compose up -d")
+            print_instances(instances)
+        return 1
+
+    sessions = [
+        slot["session"]["sessionId"]
+        for node in status.get("nodes", [])
+        for slot in node.get("slots", [])
+        if slot.get("session")
+    ]
+    if args.json:
+        print(json.dumps({"ready": status.get("ready", False), "message": status.get("message", ""),
+                          "sessions": sessions, "instances": instances}))
+    else:
+        icon = "✅" if status.get("ready") else "⚠️ "
+        print(f"{icon} Hub: {status.get('message', 'no message')}")
+        print(f"🔗 Active sessions: {len(sessions)}")
+        for session_id in sessions:
+            print(f"   • {session_id}")
+        print_instances(instances)
+    return 0 if status.get("ready") else 1
+
+
+def cmd_options(args):
+    from chrome_options import PROFILES, wants_headless
+
+    names = [args.profile] if args.profile else list(PROFILES)
+    for name in names:
+        if name not in PROFILES:
+            print(f"❌ Unknown options profile '{name}' (choose from: {', '.join(PROFILES)})")
+            return 1
+        print(f"⚙️  {name}:")
+        for arg in PROFILES[name]["args"]:
+            print(f"   {arg}")
+        if PROFILES[name]["hide_automation"]:
+            print("   (excludeSwitches=enable-automation, useAutomationExtension=False)")
+        print(f"   headless now: {'yes' if wants_headless(name) else 'no'}")
+    return 0
+
+
+def cmd_startup_bench(args):
+    """Time quick commands in fresh interpreters and check nothing heavy is imported"""
+    import statistics
+    import subprocess
+    import time
+
+    def time_runs(argv):
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    baseline = time_runs([sys.executable, "-c", "pass"])
+    print(f"⏱️  Startup over {args.runs} runs (budget: +{args.budget:.0f}ms over bare interpreter)")
+    print(f"   🐍 bare interpreter      median {baseline:6.1f}ms")
+
+    quick_commands = [["--help"], ["options", "forever"], ["status", "--local"]]
+    over_budget = False
+    for command in quick_commands:
+        argv = [sys.executable, os.path.abspath(__file__)] + command
+        median = time_runs(argv)
+
+        # -X importtime lists every imported module on stderr
+        trace = subprocess.run([sys.executable, "-X", "importtime"] + argv[1:],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+        imported = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in trace.splitlines() if "|" in line}
+        heavy = sorted(imported & set(HEAVY_MODULES))
+
+        overhead = median - baseline
+        ok = overhead <= args.budget and not heavy
+        over_budget = over_budget or not ok
+        print(f"   {'✅' if ok else '❌'} {' '.join(command):<20} median {median:6.1f}ms (+{overhead:.1f}ms)"
+              + (f"  heavy imports: {', '.join(heavy)}" if heavy else ""))
+
+    return 1 if over_budget else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="chrome97.py",
+        description="Chrome 97 Simulator - connect, test, profile and monitor Chrome 97 sessions",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="<command>")
+
+    for name, (script, help_text) in SCRIPT_COMMANDS.items():
+        # Arguments (including --help) are passed through to the script untouched
+        cmd = sub.add_parser(name, help=help_text, add_help=False)
+        cmd.add_argument("args", nargs=argparse.REMAINDER)
+
+    status = sub.add_parser("status", help="Hub readiness, active sessions and local run_forever instances")
+    status.add_argument("--json", action="store_true", help="Machine-readable output")
+    status.add_argument("--local", action="store_true",
+                        help="Only read the local status board (no hub request)")
+    status.add_argument("--webdriver-url", default=WEBDRIVER_URL)
+    status.set_defaults(func=cmd_status)
+
+    options = sub.add_parser("options", help="Show shared Chrome option profiles")
+    options.add_argument("profile", nargs="?")
+    options.set_defaults(func=cmd_options)
+
+    bench = sub.add_parser("startup-bench", help="Measure CLI startup time against the budget")
+    bench.add_argument("--runs", type=int, default=10)
+    bench.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                       help="Allowed milliseconds over bare interpreter startup")
+    bench.set_defaults(func=cmd_startup_bench)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Script commands skip argparse entirely so their own parsers see every flag
+    if argv and argv[0] in SCRIPT_COMMANDS:
+        run_script(argv[0], argv[1:])
+        return 0
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 0
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Shared Chrome 97 option profiles used by every harness script
+"""
+
+# Profiles are plain data so listing them (e.g. `chrome97.py options`) does not
+# need to import selenium; create_chrome_options() imports it on first use.
+
+import os
+
+# Compose service without Xvfb/VNC (see docker-compose.yml); CHROME97_SERVICE
+# names the node in use, as in warm_profile.py
+HEADLESS_SERVICE = "selenium-chrome-headless"
+
+BASE_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+]
+
+HIDE_AUTOMATION_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+]
+
+ROBUST_ARGS = [
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-gpu',
+    '--remote-debugging-port=9222',
+]
+
+KEEP_ALIVE_ARGS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-background-networking',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--keep-alive-for-test',
+    '--disable-hang-monitor',
+]
+
+HEADLESS_ARGS = [
+    '--headless',
+    '--hide-scrollbars',
+    '--mute-audio',
+]
+
+PROFILES = {
+    # Interactive sessions watched through noVNC (connect_to_frontend.py, connect_2hours.py)
+    "interactive": {
+        "args": BASE_ARGS + ['--window-size=1400,900'] + HIDE_AUTOMATION_ARGS,
+        "hide_automation": True,
+        "watched": True,
+    },
+    # Long sessions with auto-reconnect (connect_24hours.py)
+    "robust": {
+        "args": BASE_ARGS + ['--window-size=1400,900'] + HIDE_AUTOMATION_ARGS + ROBUST_ARGS,
+        "hide_automation": True,
+        "watched": True,
+    },
+    # Infinite sessions (run_forever.py)
+    "forever": {
+        "args": BASE_ARGS + ['--window-size=1600,1000'] + HIDE_AUTOMATION_ARGS + ROBUST_ARGS + KEEP_ALIVE_ARGS,
+        "hide_automation": True,
+        "watched": True,
+    },
+    # Automated tests (selenium_test.py, parallel_runner.py)
+    "test": {
+        "args": BASE_ARGS + [
+            '--disable-gpu',
+            '--window-size=1920,1080',
+            '--disable-extensions',
+            '--disable-plugins',
+        ],
+        "hide_automation": False,
+        "watched": False,
+    },
+    # Unattended CI runs: no rendering to a display at all (pairs with the
+    # selenium-chrome-headless compose service)
+    "headless": {
+        "args": BASE_ARGS + [
+            '--disable-gpu',
+            '--window-size=1920,1080',
+            '--disable-extensions',
+            '--disable-plugins',
+        ] + HEADLESS_ARGS,
+        "hide_automation": False,
+        "watched": False,
+    },
+}
+
+
+def _env_flag(name):
+    value = os.environ.get(name)
+    if value is None:
+        return None
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_unattended():
+    """Whether this run is declared unattended: CI, or CHROME97_UNATTENDED=1
+
+    A missing terminal is not enough: IDE consoles, nohup and npm scripts have
+    none and are still watched through noVNC.
+    """
+    return bool(os.environ.get("CI")) or bool(_env_flag("CHROME97_UNATTENDED"))
+
+
+def wants_headless(profile):
+    """Decide headless mode for a profile
+
+    CHROME97_HEADLESS=1/0 forces the choice, and the headless node (it has no
+    display) forces every profile headless. Otherwise profiles watched through
+    noVNC stay headed and the rest go headless when the run is unattended.
+    """
+    forced = _env_flag("CHROME97_HEADLESS")
+    if forced is not None:
+        return forced
+    if os.environ.get("CHROME97_SERVICE") == HEADLESS_SERVICE:
+        return True
+    return not PROFILES[profile]["watched"] and is_unattended()
+
+
+def watch_hint(profile):
+    """Where to watch a session of this profile, for the scripts' startup banner"""
+    if wants_headless(profile):
+        return "🕶️ Headless session: there is nothing to watch in noVNC"
+    return "🖥️ Watch in noVNC: http://localhost:7900"
+
+
+def create_chrome_options(profile="interactive", headless=None):
+    """Build selenium ChromeOptions for a named profile
+
+    ``headless=None`` decides automatically (see wants_headless).
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown options profile '{profile}' (choose from: {', '.join(PROFILES)})")
+
+    settings = PROFILES[profile]
+    if headless is None:
+        headless = wants_headless(profile)
+
+    options = Options()
+    for arg in settings["args"]:
+        options.add_argument(arg)
+    if headless:
+        for arg in HEADLESS_ARGS:
+            if arg not in settings["args"]:
+                options.add_argument(arg)
+    if settings["hide_automation"]:
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+    return options
@@ -3,36 +3,33 @@
 Connect Chrome 97 to your frontend app for 2 hours
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
 import sys
 
+from chrome_options import create_chrome_options, watch_hint
+from page_readiness import DEFAULT_SCRIPT_TIMEOUT, wait_for_page_ready
+from harness_log import get_logger, setup_logging
+
+log = get_logger("connect_2hours")
+
 def connect_for_2_hours(port=3000):
     """Connect Chrome 97 to your frontend app for 2 hours"""
+    from selenium import webdriver
+    
     
     frontend_url = f"http://host.docker.internal:{port}"
     
-    print(f"🚀 Connecting Chrome 97 to your frontend for 2 HOURS...")
-    print(f"📍 URL: {frontend_url}")
-    print(f"🖥️ Watch in noVNC: http://localhost:7900")
-    print("=" * 60)
+    log.info(f"🚀 Connecting Chrome 97 to your frontend for 2 HOURS...")
+    log.info(f"📍 URL: {frontend_url}")
+    log.info(watch_hint("interactive"))
+    log.info("=" * 60)
     
     # Chrome options for better interaction
-    options = Options()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1400,900')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
+    options = create_chrome_options("interactive")
     
     driver = None
     try:
-        print("🌐 Opening Chrome 97...")
+        log.info("🌐 Opening Chrome 97...")
         driver = webdriver.Remote(
             command_executor="http://localhost:4444/wd/hub",
             options=options
@@ -41,26 +38,24 @@ def connect_for_2_hours(port=3000):
         # Remove automation indicators
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
-        print(f"📱 Navigating to {frontend_url}...")
+        log.info(f"📱 Navigating to {frontend_url}...")
         driver.get(frontend_url)
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
+        wait_for_page_ready(driver, 10, script_timeout=DEFAULT_SCRIPT_TIMEOUT)
         
         title = driver.title
-        print(f"✅ Connected! Page title: {title}")
+        log.info(f"✅ Connected! Page title: {title}")
         
-        print("\n🎮 Chrome 97 is now connected to your frontend!")
-        print("🖥️ Go to http://localhost:7900 to interact with it")
-        print("⌨️ You can:")
-        print("   • Click buttons and links")
-        print("   • Fill forms")
-        print("   • Navigate around your app")
-        print("   • Test all functionality")
-        print("\n⏰ Chrome will stay open for 2 HOURS (7200 seconds)...")
-        print("   Press Ctrl+C to close early")
+        log.info("\n🎮 Chrome 97 is now connected to your frontend!")
+        log.info(watch_hint("interactive"))
+        log.info("⌨️ You can:")
+        log.info("   • Click buttons and links")
+        log.info("   • Fill forms")
+        log.info("   • Navigate around your app")
+        log.info("   • Test all functionality")
+        log.info("\n⏰ Chrome will stay open for 2 HOURS (7200 seconds)...")
+        log.info("   Press Ctrl+C to close early")
         
         # Keep browser open for 2 hours
         total_seconds = 7200  # 2 hours
@@ -71,26 +66,27 @@ def connect_for_2_hours(port=3000):
                     current_url = driver.current_url
                     minutes_elapsed = i // 60
                     minutes_remaining = (total_seconds - i) // 60
-                    print(f"⏱️  {minutes_elapsed}min elapsed, {minutes_remaining}min remaining | URL: {current_url}")
+                    log.info(f"⏱️  {minutes_elapsed}min elapsed, {minutes_remaining}min remaining | URL: {current_url}")
         except KeyboardInterrupt:
-            print("\n🛑 Closing browser early...")
+            log.info("\n🛑 Closing browser early...")
         
-        print(f"\n⏰ 2 hours completed! Closing browser...")
+        log.info(f"\n⏰ 2 hours completed! Closing browser...")
         return driver
         
     except Exception as e:
-        print(f"❌ Connection failed: {e}")
-        print("\n💡 Troubleshooting:")
-        print(f"1. Make sure your frontend is running on localhost:{port}")
-        print(f"2. Test from Mac: curl -I http://localhost:{port}")
-        print("3. Ensure your app binds to 0.0.0.0, not just 127.0.0.1")
+        log.error(f"❌ Connection failed: {e}")
+        log.info("\n💡 Troubleshooting:")
+        log.info(f"1. Make sure your frontend is running on localhost:{port}")
+        log.info(f"2. Test from Mac: curl -I http://localhost:{port}")
+        log.info("3. Ensure your app binds to 0.0.0.0, not just 127.0.0.1")
         return None
         
     finally:
         if driver:
             driver.quit()
-            print("🔚 Browser closed")
+            log.info("🔚 Browser closed")
 
 if __name__ == "__main__":
+    setup_logging()
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
     connect_for_2_hours(port)
@@ -3,36 +3,33 @@
 Connect Chrome 97 to your frontend app running on any port
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
 import sys
 
+from chrome_options import create_chrome_options, watch_hint
+from page_readiness import DEFAULT_SCRIPT_TIMEOUT, wait_for_page_ready
+from harness_log import get_logger, setup_logging
+
+log = get_logger("connect")
+
 def connect_to_frontend(port=3000, keep_open=True):
     """Connect Chrome 97 to your frontend app"""
+    from selenium import webdriver
+    
     
     frontend_url = f"http://host.docker.internal:{port}"
     
-    print(f"🚀 Connecting Chrome 97 to your frontend app...")
-    print(f"📍 URL: {frontend_url}")
-    print(f"🖥️ Watch in noVNC: http://localhost:7900")
-    print("=" * 60)
+    log.info(f"🚀 Connecting Chrome 97 to your frontend app...")
+    log.info(f"📍 URL: {frontend_url}")
+    log.info(watch_hint("interactive"))
+    log.info("=" * 60)
     
     # Chrome options for better interaction
-    options = Options()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1400,900')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
+    options = create_chrome_options("interactive")
     
     driver = None
     try:
-        print("🌐 Opening Chrome 97...")
+        log.info("🌐 Opening Chrome 97...")
         driver = webdriver.Remote(
             command_executor="http://localhost:4444/wd/hub",
             options=options
@@ -41,27 +38,25 @@ def connect_to_frontend(port=3000, keep_open=True):
         # Remove automation indicators
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
-        print(f"📱 Navigating to {frontend_url}...")
+        log.info(f"📱 Navigating to {frontend_url}...")
         driver.get(frontend_url)
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
+        wait_for_page_ready(driver, 10, script_timeout=DEFAULT_SCRIPT_TIMEOUT)
         
         title = driver.title
-        print(f"✅ Connected! Page title: {title}")
+        log.info(f"✅ Connected! Page title: {title}")
         
         if keep_open:
-            print("\n🎮 Chrome 97 is now connected to your frontend!")
-            print("🖥️ Go to http://localhost:7900 to interact with it")
-            print("⌨️ You can:")
-            print("   • Click buttons and links")
-            print("   • Fill forms")
-            print("   • Navigate around your app")
-            print("   • Test all functionality")
-            print("\n⏰ Chrome will stay open for 10 minutes...")
-            print("   Press Ctrl+C to close early")
+            log.info("\n🎮 Chrome 97 is now connected to your frontend!")
+            log.info(watch_hint("interactive"))
+            log.info("⌨️ You can:")
+            log.info("   • Click buttons and links")
+            log.info("   • Fill forms")
+            log.info("   • Navigate around your app")
+            log.info("   • Test all functionality")
+            log.info("\n⏰ Chrome will stay open for 10 minutes...")
+            log.info("   Press Ctrl+C to close early")
             
             # Keep browser open for interaction
             try:
@@ -69,27 +64,30 @@ def connect_to_frontend(port=3000, keep_open=True):
                     time.sleep(1)
                     if i % 30 == 0:  # Every 30 seconds
                         current_url = driver.current_url
-                        print(f"📍 Current URL: {current_url}")
+                        log.info(f"📍 Current URL: {current_url}")
             except KeyboardInterrupt:
-                print("\n🛑 Closing browser...")
+                log.info("\n🛑 Closing browser...")
         
         return driver
         
     except Exception as e:
-        print(f"❌ Connection failed: {e}")
-        print("\n💡 Troubleshooting:")
-        print(f"1. Make sure your frontend is running on localhost:{port}")
-        print(f"2. Test from Mac: curl -I http://localhost:{port}")
-        print("3. Ensure your app binds to 0.0.0.0, not just 127.0.0.1")
+        log.error(f"❌ Connection failed: {e}")
+        log.info("\n💡 Troubleshooting:")
+        log.info(f"1. Make sure your frontend is running on localhost:{port}")
+        log.info(f"2. Test from Mac: curl -I http://localhost:{port}")
+        log.info("3. Ensure your app binds to 0.0.0.0, not just 127.0.0.1")
         return None
         
     finally:
         if driver and not keep_open:
             driver.quit()
-            print("🔚 Browser closed")
+            log.info("🔚 Browser closed")
 
 def main():
     """Main function with port selection"""
+    setup_logging()
+    
+    # The banner and port prompt stay on plain stdout so they appear before input()
     print("🎯 Chrome 97 Frontend Connector")
     print("=" * 40)
     
@@ -97,7 +95,7 @@ def main():
         try:
             port = int(sys.argv[1])
         except ValueError:
-            print("❌ Invalid port number")
+            log.error("❌ Invalid port number")
             sys.exit(1)
     else:
         print("📝 Enter the port your frontend is running on:")
@@ -114,7 +112,7 @@ def main():
             print("\n❌ Invalid input or cancelled")
             sys.exit(1)
     
-    print(f"\n🚀 Connecting to localhost:{port}...")
+    log.info(f"\n🚀 Connecting to localhost:{port}...")
     driver = connect_to_frontend(port)
     
     if not driver:
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Density benchmark - sessions per container, memory per session and page load, VNC vs headless
+"""
+
+from chrome_options import create_chrome_options
+from cdp import create_remote_driver, free_slots, hub_status
+from warm_profile import measure_page_load
+from harness_log import setup_logging
+import subprocess
+import argparse
+import time
+import sys
+
+MODES = {
+    # mode: (compose service, container name, headless Chrome flags)
+    "vnc": ("selenium-chrome", "selenium-chrome-97", False),
+    "headless": ("selenium-chrome-headless", "selenium-chrome-97-headless", True),
+}
+
+
+def switch_to(mode, timeout=120):
+    """Stop the other node and start this mode's node, waiting for the hub to be ready"""
+    service = MODES[mode][0]
+    for other, (other_service, _, _) in MODES.items():
+        if other != mode:
+            subprocess.run(["docker-compose", "stop", other_service], capture_output=True)
+    subprocess.run(["docker-compose", "--profile", "headless", "up", "-d", service], capture_output=True, check=True)
+
+    print(f"⏳ Waiting for {service} to become ready...")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if hub_status().get("ready"):
+                return
+        except Exception:
+            pass
+        time.sleep(2)
+    raise RuntimeError(f"{service} did not become ready within {timeout}s")
+
+
+def _mib(value):
+    value = value.strip()
+    units = {"KiB": 1 / 1024, "MiB": 1, "GiB": 1024, "kB": 1 / 1024, "MB": 1, "GB": 1024, "B": 1 / (1024 * 1024)}
+    for unit, factor in units.items():
+        if value.endswith(unit):
+            return float(value[:-len(unit)]) * factor
+    return 0.0
+
+
+def container_stats(container):
+    """Return (memory MiB, memory limit MiB, CPU %) for a container from a single docker stats sample"""
+    output = subprocess.run(
+        ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}|{{.CPUPerc}}", container],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    mem, cpu = output.split("|")
+    used, _, limit = mem.partition("/")
+    return _mib(used), _mib(limit), float(cpu.rstrip("%") or 0)
+
+
+def bench_mode(mode, url, max_sessions, max_memory=None):
+    """Open sessions until one can't be created or the container crosses the memory limit
+
+    ``max_memory`` is in MiB; by default 90% of the container's memory limit.
+    """
+    _, container, headless = MODES[mode]
+    baseline_mem, mem_limit, _ = container_stats(container)
+    limit = max_memory or mem_limit * 0.9
+    _, slots = free_slots()
+    print(f"🐳 {mode}: {slots} slots, baseline {baseline_mem:.0f} MiB, "
+          f"opening sessions until one fails or memory passes {limit:.0f} MiB")
+
+    drivers = []
+    load_times = []
+    stopped = f"--max-sessions {max_sessions} reached"
+    try:
+        while len(drivers) < max_sessions:
+            # A full node queues new sessions instead of refusing them, so stop here
+            if free_slots()[0] == 0:
+                stopped = f"node full ({slots} slots)"
+                break
+            try:
+                driver = create_remote_driver(create_chrome_options("test", headless=headless))
+            except Exception as e:
+                stopped = f"session creation failed: {str(e).splitlines()[0] if str(e) else type(e).__name__}"
+                break
+            drivers.append(driver)
+            try:
+                load_ms, _ = measure_page_load(driver, url)
+            except Exception as e:
+                stopped = f"session {len(drivers)} could not load the page: {e}"
+                break
+            load_times.append(load_ms)
+            used_mem, _, _ = container_stats(container)
+            print(f"   session {len(drivers)}: page load {load_ms}ms, container {used_mem:.0f} MiB")
+            if used_mem >= limit:
+                stopped = f"memory {used_mem:.0f} MiB >= {limit:.0f} MiB"
+                break
+
+        print(f"   stopped: {stopped}")
+        # Let background work settle before sampling
+        time.sleep(5)
+        loaded_mem, _, idle_cpu = container_stats(container)
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    sessions = len(load_times)
+    return {
+        "slots": slots,
+        "sessions": sessions,
+        "stopped": stopped,
+        "baseline_mib": baseline_mem,
+        "mib_per_session": (loaded_mem - baseline_mem) / len(drivers) if drivers else 0.0,
+        "avg_load_ms": sum(load_times) / len(load_times) if load_times else 0.0,
+        "cpu_percent": idle_cpu,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare VNC and headless Chrome 97 nodes")
+    parser.add_argument("port", nargs="?", type=int, default=3000)
+    parser.add_argument("--modes", default="vnc,headless", help="Comma-separated modes to run")
+    parser.add_argument("--max-sessions", type=int, default=32, help="Upper bound on sessions to open")
+    parser.add_argument("--max-memory", type=float,
+                        help="Stop once the container uses this many MiB (default: 90%% of its memory limit)")
+    parser.add_argument("--no-switch", action="store_true",
+                        help="Benchmark whichever node is running instead of starting each one")
+    args = parser.parse_args()
+    setup_logging()
+
+    url = f"http://host.docker.internal:{args.port}"
+    modes = args.modes.split(",")
+    results = {}
+
+    for mode in modes:
+        if mode not in MODES:
+            print(f"❌ Unknown mode '{mode}' (choose from: {', '.join(MODES)})")
+            sys.exit(1)
+        try:
+            if not args.no_switch:
+                switch_to(mode)
+            results[mode] = bench_mode(mode, url, args.max_sessions, args.max_memory)
+        except Exception as e:
+            print(f"❌ {mode} benchmark failed: {e}")
+
+    print("=" * 60)
+    print(f"{'mode':<10}{'sessions':>9}{'slots':>6}{'baseline MiB':>14}{'MiB/session':>13}{'load ms':>9}{'CPU %':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['sessions']:>9}{r['slots']:>6}{r['baseline_mib']:>14.0f}{r['mib_per_session']:>13.0f}"
+              f"{r['avg_load_ms']:>9.0f}{r['cpu_percent']:>8.1f}")
+    for mode, r in results.items():
+        print(f"   {mode}: {r['stopped']}")
+
+    if not args.no_switch and "vnc" in modes:
+        # Leave the default desktop node running as before
+        switch_to("vnc")
+
+
+if __name__ == "__main__":
+    main()
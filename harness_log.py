@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Non-blocking structured logging for the Chrome 97 harness
+"""
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import datetime
+import logging
+import atexit
+import queue
+import json
+import sys
+import os
+
+# Records are dropped (and counted) rather than blocking the caller when the queue is full
+QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        # Report earlier drops on the next record that gets through; the count
+        # is only cleared once that record is actually queued
+        if self.dropped:
+            record.dropped_records = self.dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped = 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message plus any extra fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Human-readable rendering: the message as the scripts always printed it"""
+
+    def __init__(self, timestamps=False):
+        super().__init__()
+        self.timestamps = timestamps
+
+    def format(self, record):
+        message = record.getMessage()
+        if self.timestamps:
+            message = f"{datetime.datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} {message}"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+def setup_logging(log_file=None, level=None, console=True, timestamps=False,
+                  max_bytes=10 * 1024 * 1024, backups=5):
+    """Route all ``chrome97.*`` loggers through a background queue listener.
+
+    Defaults come from ``CHROME97_LOG_FILE`` and ``CHROME97_LOG_LEVEL`` so cron and
+    CI jobs can turn on file logging without changing command lines.
+    """
+    global _listener
+    if _listener:
+        return logging.getLogger("chrome97")
+
+    log_file = log_file or os.environ.get("CHROME97_LOG_FILE")
+    level = (level or os.environ.get("CHROME97_LOG_LEVEL", "INFO")).upper()
+
+    sinks = []
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        sinks.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(ConsoleFormatter(timestamps))
+        sinks.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    _listener = QueueListener(log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger("chrome97")
+    root.setLevel(level)
+    root.propagate = False
+    root.handlers = [DroppingQueueHandler(log_queue)]
+    return root
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name):
+    """Logger under the harness namespace, e.g. get_logger("forever")"""
+    return logging.getLogger(f"chrome97.{name}")
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Hot reload for live Chrome 97 sessions - watches a build directory and refreshes the page
+"""
+
+from cdp import WEBDRIVER_URL, attach_to_session, list_hub_sessions
+from page_readiness import wait_for_page_ready
+from harness_log import get_logger, setup_logging
+from status_board import read_board
+import ctypes.util
+import argparse
+import platform
+import ctypes
+import select
+import struct
+import time
+import sys
+import os
+
+log = get_logger("hot_reload")
+
+IGNORED_DIRS = {".git", "node_modules", "__pycache__", ".cache", ".parcel-cache"}
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~", ".map")
+
+# inotify event bits (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_ignored(path):
+    parts = path.split(os.sep)
+    return any(part in IGNORED_DIRS for part in parts) or path.endswith(IGNORED_SUFFIXES)
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on Linux inotify (via libc, no extra dependency)"""
+
+    def __init__(self, root):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            self._add(dirpath)
+
+    def _add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = path
+
+    def changes(self, timeout):
+        """Block up to ``timeout`` seconds; return the set of changed file paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Kernel queue overflowed: we lost track, treat it as "everything changed"
+                changed.add("*")
+                continue
+            path = os.path.join(self.dirs.get(wd, ""), name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not is_ignored(path):
+                    # Files can land in a new directory before its watch exists
+                    for dirpath, dirnames, filenames in os.walk(path):
+                        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+                        self._add(dirpath)
+                        changed.update(os.path.join(dirpath, f) for f in filenames)
+                    changed.add(path)
+                continue
+            if name and not is_ignored(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """mtime-scanning fallback for platforms without inotify (e.g. macOS hosts)"""
+
+    def __init__(self, root, interval=0.25):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if is_ignored(path):
+                    continue
+                try:
+                    files[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+        return files
+
+    def changes(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {p for p, m in current.items() if self.snapshot.get(p) != m}
+        changed |= set(self.snapshot) - set(current)
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(root):
+    if platform.system() == "Linux":
+        try:
+            return InotifyWatcher(root)
+        except OSError as e:
+            log.warning(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root)
+
+
+def next_batch(watcher, debounce_ms=100, max_wait_ms=1000):
+    """Wait for a burst of changes and return it once the burst goes quiet.
+
+    Returns (changed paths, monotonic time of the first event in the burst).
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.changes(1.0)
+    first_event = time.monotonic()
+    deadline = first_event + max_wait_ms / 1000
+    while time.monotonic() < deadline:
+        more = watcher.changes(debounce_ms / 1000)
+        if not more:
+            break
+        changed |= more
+    return changed, first_event
+
+
+# Swap matching stylesheets in place: the new <link> is inserted next to the old
+# one and the old one removed once the new one has loaded, so there's no flash
+# of unstyled content. Resolves with the number of sheets swapped (0 = none matched).
+CSS_SWAP_SCRIPT = """
+var changed = arguments[0];
+var done = arguments[arguments.length - 1];
+var stamp = Date.now();
+var links = Array.prototype.slice.call(document.querySelectorAll('link[rel="stylesheet"]'));
+var targets = links.filter(function (link) {
+    var path = link.href.split('?')[0];
+    return changed.some(function (name) { return path.slice(-name.length - 1) === '/' + name; });
+});
+if (!targets.length) { done(0); return; }
+var pending = targets.length;
+targets.forEach(function (link) {
+    var fresh = link.cloneNode();
+    fresh.href = link.href.split('?')[0] + '?hot=' + stamp;
+    var settle = function () {
+        if (link.parentNode) link.parentNode.removeChild(link);
+        if (--pending === 0) done(targets.length);
+    };
+    fresh.addEventListener('load', settle);
+    fresh.addEventListener('error', settle);
+    link.parentNode.insertBefore(fresh, link.nextSibling);
+});
+"""
+
+
+def refresh(driver, changed, ready_timeout=30):
+    """Apply a batch of changes to the page; returns 'css' or 'reload'"""
+    if "*" not in changed and changed and all(path.endswith(".css") for path in changed):
+        swapped = driver.execute_async_script(CSS_SWAP_SCRIPT, sorted(os.path.basename(p) for p in changed))
+        if swapped:
+            return "css"
+    # WebDriver's refresh blocks until the new document has loaded
+    driver.refresh()
+    wait_for_page_ready(driver, ready_timeout)
+    return "reload"
+
+
+def session_owner(session_id):
+    """pid of the run_forever.py instance publishing ``session_id`` on the status board, if any"""
+    for entry in read_board():
+        if entry["session_id"] == session_id:
+            return entry["pid"]
+    return None
+
+
+def find_session(webdriver_url, previous=None, owner=None):
+    """Pick a live session other than ``previous`` to attach to, or None
+
+    While ``owner`` (a status board pid) is running, only its replacement
+    session will do: it publishes that after the page is ready, seconds after
+    the hub lists it, and any other session belongs to another app. Without
+    a live owner, takes the first session the hub lists.
+    """
+    hub_sessions = [session_id for session_id, _ in list_hub_sessions(webdriver_url) if session_id != previous]
+    if owner:
+        entries = [entry for entry in read_board() if entry["pid"] == owner]
+        for entry in entries:
+            if entry["session_id"] in hub_sessions:
+                return entry["session_id"]
+        if any(entry["state"] not in ("stopped", "stale") for entry in entries):
+            return None
+    return hub_sessions[0] if hub_sessions else None
+
+
+def reattach(session_id, owner, webdriver_url, poll=2.0):
+    """Wait for a replacement of the ended session ``session_id`` and attach to it"""
+    log.warning(f"🔌 Session {session_id} ended, looking for its replacement...")
+    while True:
+        try:
+            replacement = find_session(webdriver_url, session_id, owner)
+        except Exception as e:
+            log.warning(f"⚠️  Cannot list hub sessions: {e}")
+            replacement = None
+        if replacement:
+            log.info(f"🔗 Reattached to session {replacement}",
+                     extra={"event": "hot_reload_reattach", "previous": session_id, "session_id": replacement})
+            return replacement, attach_to_session(replacement, webdriver_url)
+        time.sleep(poll)
+
+
+def watch(session_id, root, debounce_ms=100, webdriver_url=WEBDRIVER_URL):
+    """Refresh the session on every change burst under ``root`` until interrupted
+
+    If the session ends (run_forever.py reconnected, or the browser was
+    restarted) the watcher reattaches to the replacement session.
+    """
+    from selenium.common.exceptions import InvalidSessionIdException
+
+    driver = attach_to_session(session_id, webdriver_url)
+    owner = session_owner(session_id)
+    log.info(f"🔗 Attached to session {session_id}")
+    watcher = create_watcher(root)
+    log.info(f"👀 Watching {root} ({type(watcher).__name__}), debounce {debounce_ms}ms")
+    log.info("🛑 Press Ctrl+C to stop")
+    try:
+        while True:
+            changed, first_event = next_batch(watcher, debounce_ms)
+            names = ", ".join(sorted(os.path.basename(p) for p in changed)[:5])
+            try:
+                try:
+                    mode = refresh(driver, changed)
+                except InvalidSessionIdException:
+                    session_id, driver = reattach(session_id, owner, webdriver_url)
+                    owner = session_owner(session_id) or owner
+                    # The replacement session loaded the page before this change: reload it
+                    mode = refresh(driver, {"*"})
+            except Exception as e:
+                log.error(f"❌ Refresh failed: {e}")
+                continue
+            latency_ms = (time.monotonic() - first_event) * 1000
+            icon = "🎨" if mode == "css" else "🔄"
+            log.info(f"{icon} {mode} in {latency_ms:.0f}ms ({len(changed)} changed: {names})",
+                     extra={"event": "hot_reload", "mode": mode, "latency_ms": round(latency_ms),
+                            "files": len(changed)})
+    except KeyboardInterrupt:
+        log.info("\n🛑 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh a live Chrome 97 session when files change")
+    parser.add_argument("directory", help="Source or build output directory to watch")
+    parser.add_argument("--session", help="Session id to attach to (default: first session on the hub)")
+    parser.add_argument("--debounce", type=int, default=100, help="Quiet period in ms before refreshing")
+    parser.add_argument("--webdriver-url", default=WEBDRIVER_URL)
+    args = parser.parse_args()
+    setup_logging()
+
+    if not os.path.isdir(args.directory):
+        log.error(f"❌ Not a directory: {args.directory}")
+        sys.exit(1)
+
+    session_id = args.session
+    if not session_id:
+        try:
+            sessions = list_hub_sessions(args.webdriver_url)
+        except Exception as e:
+            log.error(f"❌ Cannot list hub sessions: {e}")
+            sys.exit(1)
+        if not sessions:
+            log.error("❌ No live sessions. Start one with run_forever.py or connect_to_frontend.py")
+            sys.exit(1)
+        session_id = sessions[0][0]
+
+    watch(session_id, os.path.abspath(args.directory), args.debounce, args.webdriver_url)
+
+
+if __name__ == "__main__":
+    main()
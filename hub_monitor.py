@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Hub/container status coordinator - one status check per outage, not one per caller
+"""
+
+# Every failed health check used to query /wd/hub/status and `docker-compose ps`
+# itself, and every run_forever.py instance did the same. The coordinator gives
+# each query a short TTL cache and runs it single-flight: callers in this
+# process wait on a thread lock, other processes wait on a flock in /dev/shm,
+# and whoever gets there second reuses the first caller's answer. An observed
+# failure invalidates results checked before it was observed, so the next
+# caller checks again but callers reporting the same outage don't.
+from contextlib import contextmanager
+import subprocess
+import threading
+import fcntl
+import json
+import time
+import os
+
+from cdp import WEBDRIVER_URL, hub_status
+from warm_profile import CONTAINER_SERVICE
+from harness_log import get_logger
+
+log = get_logger("hub_monitor")
+
+CACHE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+STATUS_TTL = 5.0
+# Skip a restart if any instance restarted the container this recently (it is still coming up)
+RESTART_GRACE = 60.0
+# docker-compose calls run under the coordinator's flock, so a hung docker
+# daemon must not hold every other instance's status check hostage
+PS_TIMEOUT = 15
+RESTART_TIMEOUT = 120
+
+
+class StatusCoordinator:
+    """Cached, single-flight hub and container status shared by all instances on this host"""
+
+    def __init__(self, webdriver_url=WEBDRIVER_URL, service=CONTAINER_SERVICE, ttl=STATUS_TTL):
+        self.webdriver_url = webdriver_url
+        self.service = service
+        self.ttl = ttl
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+        self.checks = 0  # status queries actually executed by this process
+
+    def _path(self, key, suffix):
+        return os.path.join(CACHE_DIR, f"chrome97-{self.service}-{key}.{suffix}")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key, "json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key, value):
+        path = self._path(key, "json")
+        tmp = f"{path}.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _locked(self, key):
+        """Exclusive access to one key across threads and processes"""
+        with self.locks_guard:
+            lock = self.locks.setdefault(key, threading.Lock())
+        with lock:
+            fd = os.open(self._path(key, "lock"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _single_flight(self, key, fetch, max_age):
+        """Return a cached result younger than ``max_age`` or run ``fetch`` exactly once"""
+        with self._locked(key):
+            cached = self._read(key)
+            if cached and time.time() - cached["checked_at"] < max_age:
+                return cached
+            self.checks += 1
+            result = dict(fetch(), checked_at=time.time())
+            self._write(key, result)
+            return result
+
+    def _fetch_hub(self):
+        try:
+            status = hub_status(self.webdriver_url, timeout=10)
+            return {"reachable": True, "ready": bool(status.get("ready")), "error": None}
+        except Exception as e:
+            return {"reachable": False, "ready": False, "error": str(e)}
+
+    def _fetch_container(self):
+        try:
+            result = subprocess.run(["docker-compose", "ps", self.service], capture_output=True, text=True,
+                                    timeout=PS_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            log.warning(f"⚠️  docker-compose ps {self.service} timed out after {PS_TIMEOUT}s, treating it as down")
+            return {"up": False}
+        return {"up": result.returncode == 0 and "Up" in result.stdout}
+
+    def hub(self, max_age=None):
+        """{'reachable', 'ready', 'error', 'checked_at'} for the WebDriver hub"""
+        return self._single_flight("hub", self._fetch_hub, self.ttl if max_age is None else max_age)
+
+    def container_up(self):
+        return self._single_flight("container", self._fetch_container, self.ttl)["up"]
+
+    def invalidate(self, *keys, observed_at=None):
+        """Drop results checked before a failure observed at ``observed_at`` (epoch, default now)
+
+        Results checked after the failure already reflect it and are kept.
+        """
+        observed_at = observed_at or time.time()
+        for key in keys or ("hub", "container"):
+            with self._locked(key):
+                cached = self._read(key)
+                if cached and cached["checked_at"] < observed_at:
+                    os.unlink(self._path(key, "json"))
+
+    def restart_container(self):
+        """Restart the container unless another caller just did; returns True if we restarted"""
+        restarted = []
+
+        def restart():
+            log.error(f"🚨 Restarting {self.service}...", extra={"event": "container_restart"})
+            try:
+                subprocess.run(["docker-compose", "restart", self.service], capture_output=True,
+                               timeout=RESTART_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                # It may still be restarting; the grace period keeps others from piling on
+                log.error(f"⏰ docker-compose restart {self.service} timed out after {RESTART_TIMEOUT}s")
+            restarted.append(True)
+            return {}
+
+        self._single_flight("restart", restart, RESTART_GRACE)
+        self.invalidate()
+        if not restarted:
+            log.info(f"⏭️  {self.service} was restarted moments ago by another instance, not restarting again")
+        return bool(restarted)
+
+
+_coordinators = {}
+_coordinators_guard = threading.Lock()
+
+
+def get_coordinator(webdriver_url=WEBDRIVER_URL):
+    """Process-wide coordinator per hub, so every caller shares the same locks"""
+    with _coordinators_guard:
+        if webdriver_url not in _coordinators:
+            _coordinators[webdriver_url] = StatusCoordinator(webdriver_url)
+        return _coordinators[webdriver_url]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Network capture for Chrome 97 sessions - streams HAR entries from the performance log
+"""
+
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import datetime
+import argparse
+import json
+import time
+
+# Upper bounds so capture can stay enabled in forever mode without growing
+MAX_PENDING_REQUESTS = 2000
+MAX_TRACKED_ORIGINS = 200
+
+
+def enable_performance_log(options):
+    """Turn on Chrome's performance log (network events only) for these options"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {
+        "enableNetwork": True,
+        "enablePage": False,
+    })
+    return options
+
+
+class HarStreamWriter:
+    """Writes a HAR 1.2 file one entry at a time instead of building it in memory"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entry_count = 0
+        self.file = open(path, "w", encoding="utf-8")
+        header = json.dumps({
+            "version": "1.2",
+            "creator": {"name": "chrome-97-simulator", "version": "1.0.0"},
+            "pages": [],
+        })
+        # Leave the log object open so entries can be appended as they complete
+        self.file.write('{"log": ' + header[:-1] + ', "entries": [\n')
+        self.file.flush()
+
+    def write_entry(self, entry):
+        if self.entry_count:
+            self.file.write(",\n")
+        self.file.write(json.dumps(entry))
+        self.file.flush()
+        self.entry_count += 1
+
+    def close(self):
+        if self.file and not self.file.closed:
+            self.file.write("\n]}}\n")
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NetworkStats:
+    """Running per-origin and per-resource-type timing and size totals"""
+
+    def __init__(self, max_origins=MAX_TRACKED_ORIGINS):
+        self.max_origins = max_origins
+        self.by_origin = {}
+        self.by_type = {}
+
+    @staticmethod
+    def _bucket(table, key):
+        if key not in table:
+            table[key] = {"requests": 0, "failed": 0, "bytes": 0, "time_ms": 0.0, "max_ms": 0.0}
+        return table[key]
+
+    def record(self, origin, resource_type, size, duration_ms, failed=False):
+        if origin not in self.by_origin and len(self.by_origin) >= self.max_origins:
+            origin = "(other)"
+        for bucket in (self._bucket(self.by_origin, origin), self._bucket(self.by_type, resource_type)):
+            bucket["requests"] += 1
+            bucket["failed"] += 1 if failed else 0
+            bucket["bytes"] += max(0, size)
+            bucket["time_ms"] += duration_ms
+            bucket["max_ms"] = max(bucket["max_ms"], duration_ms)
+
+    def report(self, top=10, emit=print):
+        """Print (or log, via ``emit``) the heaviest origins and resource types"""
+        for title, table in (("🌍 By origin", self.by_origin), ("📦 By resource type", self.by_type)):
+            emit(f"{title}:")
+            rows = sorted(table.items(), key=lambda item: item[1]["time_ms"], reverse=True)[:top]
+            for key, b in rows:
+                avg = b["time_ms"] / b["requests"] if b["requests"] else 0.0
+                emit(f"   {key}: {b['requests']} req, {b['bytes'] / 1024:.1f} KB, "
+                      f"avg {avg:.0f}ms, max {b['max_ms']:.0f}ms, {b['failed']} failed")
+
+
+class NetworkCapture:
+    """Turns Network.* performance log events into HAR entries and stats"""
+
+    def __init__(self, har_path=None, max_pending=MAX_PENDING_REQUESTS):
+        self.writer = HarStreamWriter(har_path) if har_path else None
+        self.stats = NetworkStats()
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self.events_seen = 0
+
+    def new_session(self):
+        """Forget in-flight requests from a previous browser session
+
+        Request ids restart with each browser, so a leftover pending id would
+        otherwise be mistaken for a redirect of an unrelated new request.
+        """
+        self.pending.clear()
+
+    def poll(self, driver):
+        """Drain the browser's performance log; returns the number of events handled"""
+        count = 0
+        for record in driver.get_log("performance"):
+            try:
+                message = json.loads(record["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            self.handle_event(message.get("method", ""), message.get("params", {}))
+            count += 1
+        self.events_seen += count
+        return count
+
+    def handle_event(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if request_id in self.pending:
+                # Redirect: the previous hop finishes with this event's redirectResponse
+                redirect = params.get("redirectResponse")
+                if redirect:
+                    self.pending[request_id]["response"] = redirect
+                self._finish(request_id, params.get("timestamp"), redirect.get("encodedDataLength", 0) if redirect else 0)
+            self.pending[request_id] = {
+                "request": params.get("request", {}),
+                "type": params.get("type", "Other"),
+                "wall_time": params.get("wallTime", time.time()),
+                "timestamp": params.get("timestamp", 0.0),
+                "response": None,
+            }
+            while len(self.pending) > self.max_pending:
+                # Requests that never finish (long-polls, aborted navigations) are dropped
+                self.pending.popitem(last=False)
+        elif method == "Network.responseReceived":
+            if request_id in self.pending:
+                self.pending[request_id]["response"] = params.get("response", {})
+                self.pending[request_id]["type"] = params.get("type", self.pending[request_id]["type"])
+        elif method == "Network.loadingFinished":
+            self._finish(request_id, params.get("timestamp"), params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            self._finish(request_id, params.get("timestamp"), 0, error=params.get("errorText", "failed"))
+
+    def _finish(self, request_id, end_timestamp, size, error=None):
+        pending = self.pending.pop(request_id, None)
+        if pending is None:
+            return
+        request = pending["request"]
+        response = pending["response"] or {}
+        end_timestamp = end_timestamp or pending["timestamp"]
+        total_ms = max(0.0, (end_timestamp - pending["timestamp"]) * 1000)
+
+        url = request.get("url", "")
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}" if parts.netloc else parts.scheme or "(unknown)"
+        self.stats.record(origin, pending["type"], size, total_ms, failed=error is not None)
+
+        if self.writer:
+            self.writer.write_entry(self._har_entry(pending, request, response, total_ms, size, error))
+
+    @staticmethod
+    def _har_timings(response, total_ms):
+        timing = response.get("timing")
+        if not timing:
+            return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": total_ms, "receive": 0}
+
+        def span(start, end):
+            a, b = timing.get(start, -1), timing.get(end, -1)
+            return b - a if a >= 0 and b >= 0 else -1
+
+        blocked = max(0.0, min(v for v in (timing.get("dnsStart", -1), timing.get("connectStart", -1),
+                                           timing.get("sendStart", 0)) if v >= 0))
+        send = span("sendStart", "sendEnd")
+        wait = span("sendEnd", "receiveHeadersEnd")
+        receive = max(0.0, total_ms - timing.get("receiveHeadersEnd", 0))
+        return {
+            "blocked": blocked,
+            "dns": span("dnsStart", "dnsEnd"),
+            "connect": span("connectStart", "connectEnd"),
+            "ssl": span("sslStart", "sslEnd"),
+            "send": max(0, send),
+            "wait": max(0, wait),
+            "receive": receive,
+        }
+
+    def _har_entry(self, pending, request, response, total_ms, size, error):
+        started = datetime.datetime.fromtimestamp(pending["wall_time"], datetime.timezone.utc)
+        headers = lambda h: [{"name": k, "value": str(v)} for k, v in (h or {}).items()]
+        entry = {
+            "startedDateTime": started.isoformat(),
+            "time": total_ms,
+            "request": {
+                "method": request.get("method", "GET"),
+                "url": request.get("url", ""),
+                "httpVersion": response.get("protocol", ""),
+                "cookies": [],
+                "headers": headers(request.get("headers")),
+                "queryString": [],
+                "headersSize": -1,
+                "bodySize": len(request.get("postData", "")),
+            },
+            "response": {
+                "status": response.get("status", 0),
+                "statusText": response.get("statusText", error or ""),
+                "httpVersion": response.get("protocol", ""),
+                "cookies": [],
+                "headers": headers(response.get("headers")),
+                "content": {"size": size, "mimeType": response.get("mimeType", "")},
+                "redirectURL": (response.get("headers") or {}).get("location", ""),
+                "headersSize": -1,
+                "bodySize": size,
+            },
+            "cache": {},
+            "timings": self._har_timings(response, total_ms),
+            "_resourceType": pending["type"],
+        }
+        if response.get("remoteIPAddress"):
+            entry["serverIPAddress"] = response["remoteIPAddress"]
+        if error:
+            entry["_error"] = error
+        return entry
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+def main():
+    """Load a page, capture its network activity for a while and report"""
+    from selenium import webdriver
+    from chrome_options import create_chrome_options
+
+    parser = argparse.ArgumentParser(description="Capture Chrome 97 network activity to a HAR file")
+    parser.add_argument("port", nargs="?", type=int, default=3000)
+    parser.add_argument("--har", default="chrome97.har", help="HAR output path")
+    parser.add_argument("--seconds", type=int, default=30, help="How long to keep capturing after load")
+    args = parser.parse_args()
+
+    frontend_url = f"http://host.docker.internal:{args.port}"
+    options = enable_performance_log(create_chrome_options("test"))
+
+    capture = NetworkCapture(args.har)
+    driver = None
+    try:
+        print(f"🌐 Opening Chrome 97 and loading {frontend_url}...")
+        driver = webdriver.Remote(command_executor="http://localhost:4444/wd/hub", options=options)
+        driver.get(frontend_url)
+
+        print(f"📡 Capturing network activity for {args.seconds} seconds...")
+        deadline = time.monotonic() + args.seconds
+        while time.monotonic() < deadline:
+            capture.poll(driver)
+            time.sleep(1)
+        capture.poll(driver)
+    except KeyboardInterrupt:
+        print("\n🛑 Capture stopped")
+    except Exception as e:
+        print(f"❌ Capture failed: {e}")
+    finally:
+        capture.close()
+        if driver:
+            driver.quit()
+
+    print(f"💾 Wrote {capture.writer.entry_count} entries to {args.har}")
+    capture.stats.report()
+
+
+if __name__ == "__main__":
+    main()
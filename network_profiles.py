@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Named network profiles for Chrome 97 sessions - URL blocking and throttling via CDP
+"""
+
+from cdp import execute_cdp
+
+ANALYTICS_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*segment.io*",
+    "*segment.com/analytics*",
+    "*hotjar.com*",
+    "*mixpanel.com*",
+    "*connect.facebook.net*",
+    "*sentry.io*",
+]
+
+FONT_PATTERNS = [
+    "*.woff*",
+    "*.ttf*",
+    "*.otf*",
+    "*.eot*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+]
+
+IMAGE_PATTERNS = [
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.svg*",
+    "*.ico*",
+]
+
+# Throughput is in bytes/second, latency in ms (same presets as DevTools)
+SLOW_3G = {"offline": False, "latency": 2000, "downloadThroughput": 50000, "uploadThroughput": 50000}
+FAST_3G = {"offline": False, "latency": 563, "downloadThroughput": 180000, "uploadThroughput": 84000}
+OFFLINE = {"offline": True, "latency": 0, "downloadThroughput": 0, "uploadThroughput": 0}
+NO_THROTTLING = {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+
+PROFILES = {
+    "default": {"blocked_urls": [], "conditions": None},
+    "no-analytics": {"blocked_urls": ANALYTICS_PATTERNS, "conditions": None},
+    "no-images": {"blocked_urls": IMAGE_PATTERNS, "conditions": None},
+    "lean": {"blocked_urls": ANALYTICS_PATTERNS + FONT_PATTERNS + IMAGE_PATTERNS, "conditions": None},
+    "fast-3g": {"blocked_urls": [], "conditions": FAST_3G},
+    "slow-3g": {"blocked_urls": [], "conditions": SLOW_3G},
+    "offline": {"blocked_urls": [], "conditions": OFFLINE},
+}
+
+
+def apply_network_profile(driver, name):
+    """Apply a named profile to a session created with cdp.create_remote_driver"""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile '{name}' (choose from: {', '.join(PROFILES)})")
+
+    profile = PROFILES[name]
+    execute_cdp(driver, "Network.enable")
+    execute_cdp(driver, "Network.setBlockedURLs", {"urls": profile["blocked_urls"]})
+    execute_cdp(driver, "Network.emulateNetworkConditions", profile["conditions"] or NO_THROTTLING)
+    return profile
+
+
+def describe_profiles():
+    """Print the available profiles"""
+    print("🌐 Network profiles:")
+    for name, profile in PROFILES.items():
+        parts = []
+        if profile["blocked_urls"]:
+            parts.append(f"{len(profile['blocked_urls'])} blocked patterns")
+        conditions = profile["conditions"]
+        if conditions and conditions["offline"]:
+            parts.append("offline")
+        elif conditions:
+            parts.append(f"{conditions['latency']}ms latency, {conditions['downloadThroughput'] // 1000} KB/s down")
+        print(f"   • {name}: {', '.join(parts) or 'no blocking or throttling'}")
+
+
+if __name__ == "__main__":
+    describe_profiles()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Event-driven page readiness for Chrome 97 - waits in the page, not in a polling loop
+"""
+
+import argparse
+
+READY_MODES = ("load", "network-idle", "dom-quiet", "app")
+
+# WebDriver must outwait the in-page deadline by this much so the page, not
+# WebDriver, reports the timeout
+SCRIPT_HEADROOM = 5
+# Script timeout of a session nobody has changed (W3C default)
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# Resolves the WebDriver callback once every requested condition holds, or with
+# ready=false when the in-page deadline passes. All listeners live in the page,
+# so the whole wait is a single execute_async_script round trip.
+READINESS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var opts = arguments[0];
+var start = performance.now();
+var finished = false;
+var timers = [];
+var cleanups = [];
+
+function finish(ready, reason) {
+    if (finished) return;
+    finished = true;
+    timers.forEach(clearTimeout);
+    cleanups.forEach(function (fn) { try { fn(); } catch (e) {} });
+    done({ready: ready, reason: reason, elapsedMs: Math.round(performance.now() - start),
+          readyState: document.readyState, url: location.href});
+}
+
+var pending = opts.modes.slice();
+function satisfied(mode) {
+    var i = pending.indexOf(mode);
+    if (i >= 0) pending.splice(i, 1);
+    if (pending.length === 0) finish(true, 'ready');
+}
+
+timers.push(setTimeout(function () {
+    finish(false, 'timed out waiting for: ' + pending.join(', '));
+}, opts.timeoutMs));
+
+// Re-arming quiet-period timer shared by network-idle and dom-quiet
+function quietTracker(mode, busy) {
+    var timer = null;
+    function arm() {
+        clearTimeout(timer);
+        timer = setTimeout(function () { if (!busy()) satisfied(mode); else arm(); }, opts.idleMs);
+        timers.push(timer);
+    }
+    return arm;
+}
+
+function whenLoaded(fn) {
+    if (document.readyState === 'complete') { fn(); return; }
+    var onLoad = function () { fn(); };
+    window.addEventListener('load', onLoad);
+    cleanups.push(function () { window.removeEventListener('load', onLoad); });
+}
+
+if (opts.modes.indexOf('load') >= 0) {
+    whenLoaded(function () { satisfied('load'); });
+}
+
+if (opts.modes.indexOf('network-idle') >= 0) {
+    var inflight = 0;
+    var origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function () {
+            inflight++;
+            return origFetch.apply(this, arguments).finally(function () { inflight--; armNet(); });
+        };
+        cleanups.push(function () { window.fetch = origFetch; });
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        inflight++;
+        this.addEventListener('loadend', function () { inflight--; armNet(); });
+        return origSend.apply(this, arguments);
+    };
+    cleanups.push(function () { XMLHttpRequest.prototype.send = origSend; });
+
+    var armNet = quietTracker('network-idle', function () {
+        return inflight > 0 || document.readyState !== 'complete';
+    });
+    // Resource timing entries also catch scripts, styles and images, not just fetch/XHR
+    var perfObserver = new PerformanceObserver(function () { armNet(); });
+    perfObserver.observe({type: 'resource', buffered: false});
+    cleanups.push(function () { perfObserver.disconnect(); });
+    whenLoaded(armNet);
+}
+
+if (opts.modes.indexOf('dom-quiet') >= 0) {
+    var armDom = quietTracker('dom-quiet', function () { return document.readyState !== 'complete'; });
+    var mutationObserver = new MutationObserver(function () { armDom(); });
+    mutationObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    cleanups.push(function () { mutationObserver.disconnect(); });
+    whenLoaded(armDom);
+}
+
+if (opts.modes.indexOf('app') >= 0) {
+    // Apps signal readiness by setting window[hook] = true, assigning a Promise to
+    // it, or dispatching a window event with the same name
+    var hook = opts.appHook;
+    var value = window[hook];
+    if (value === true) {
+        satisfied('app');
+    } else if (value && typeof value.then === 'function') {
+        value.then(function () { satisfied('app'); });
+    } else {
+        var onReady = function () { satisfied('app'); };
+        window.addEventListener(hook, onReady);
+        cleanups.push(function () { window.removeEventListener(hook, onReady); });
+        var descriptor = Object.getOwnPropertyDescriptor(window, hook);
+        if (!descriptor || descriptor.configurable) {
+            var stored = value;
+            Object.defineProperty(window, hook, {
+                configurable: true,
+                get: function () { return stored; },
+                set: function (v) {
+                    stored = v;
+                    if (v === true) satisfied('app');
+                    else if (v && typeof v.then === 'function') v.then(function () { satisfied('app'); });
+                }
+            });
+        }
+    }
+}
+"""
+
+
+def parse_ready_modes(value):
+    """argparse type for comma-separated readiness modes (e.g. load,network-idle)"""
+    modes = tuple(mode.strip() for mode in value.split(",") if mode.strip())
+    unknown = [mode for mode in modes if mode not in READY_MODES]
+    if unknown or not modes:
+        raise argparse.ArgumentTypeError(
+            f"unknown readiness mode(s): {', '.join(unknown) or value!r} (choose from: {', '.join(READY_MODES)})")
+    return modes
+
+
+def wait_for_page_ready(driver, timeout=30, modes=("load",), idle_ms=500, app_hook="__appReady",
+                        script_timeout=None):
+    """Block until the page is ready.
+
+    ``modes`` is any combination of:
+      - ``load``: the window ``load`` event has fired (readyState "complete")
+      - ``network-idle``: no fetch/XHR/resource activity for ``idle_ms``
+      - ``dom-quiet``: no DOM mutations for ``idle_ms``
+      - ``app``: the app set ``window.__appReady`` (or dispatched that event)
+
+    Pass ``script_timeout`` when you know the session's script timeout (you
+    set it, or the session is new: DEFAULT_SCRIPT_TIMEOUT). If it covers
+    ``timeout + SCRIPT_HEADROOM`` the wait is one WebDriver round trip.
+    Otherwise the timeout is read from the session and, if too short, raised
+    for this call and restored afterwards (up to three extra round trips).
+
+    Raises ``TimeoutException`` like ``WebDriverWait`` does, so callers can swap
+    it in for the old readyState polling loop.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    if isinstance(modes, str):
+        modes = (modes,)
+    unknown = [mode for mode in modes if mode not in READY_MODES]
+    if unknown:
+        raise ValueError(f"Unknown readiness mode(s): {', '.join(unknown)}")
+
+    # The session may belong to another process (hot_reload attaches to
+    # run_forever's), so a raised timeout is put back afterwards.
+    previous_timeout = driver.timeouts.script if script_timeout is None else script_timeout
+    raise_timeout = timeout + SCRIPT_HEADROOM > previous_timeout
+    if raise_timeout:
+        driver.set_script_timeout(timeout + SCRIPT_HEADROOM)
+    try:
+        result = driver.execute_async_script(READINESS_SCRIPT, {
+            "modes": list(modes),
+            "timeoutMs": int(timeout * 1000),
+            "idleMs": idle_ms,
+            "appHook": app_hook,
+        })
+    finally:
+        if raise_timeout:
+            driver.set_script_timeout(previous_timeout)
+
+    if not result or not result.get("ready"):
+        reason = result.get("reason") if result else "no result"
+        raise TimeoutException(f"Page not ready after {timeout}s: {reason}")
+    return result
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Parallel Chrome 97 test runner - shards test functions across long-lived sessions
+"""
+
+import chrome_options
+from cdp import create_remote_driver, execute_cdp, free_slots
+from network_profiles import PROFILES, apply_network_profile
+from warm_profile import WarmProfile
+from harness_log import setup_logging
+import importlib.util
+import inspect
+import argparse
+import threading
+import queue
+import time
+import sys
+import os
+
+WEBDRIVER_URL = "http://localhost:4444/wd/hub"
+
+
+def create_chrome_options():
+    """Create Chrome options for pooled test sessions"""
+    return chrome_options.create_chrome_options("test")
+
+
+def discover_tests(paths, pattern="test_"):
+    """Collect test functions that accept a ``driver`` argument from the given files"""
+    tests = []
+    for path in paths:
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ != module_name or not name.startswith(pattern):
+                continue
+            if "driver" not in inspect.signature(func).parameters:
+                continue
+            tests.append((f"{module_name}::{name}", func))
+    return tests
+
+
+class SessionWorker(threading.Thread):
+    """Owns one Chrome 97 session and runs tests from the shared queue on it"""
+
+    def __init__(self, worker_id, tests, results, webdriver_url=WEBDRIVER_URL, network_profile=None,
+                 warm_profile=False):
+        super().__init__(name=f"worker-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.tests = tests
+        self.results = results
+        self.webdriver_url = webdriver_url
+        self.network_profile = network_profile
+        # Chrome locks its user-data-dir, so each worker gets its own warm profile
+        self.warm_profile = WarmProfile(f"worker-{worker_id}") if warm_profile else None
+        self.driver = None
+        self.launches = 0
+        self.launch_error = None
+
+    def start_session(self):
+        """Launch a fresh browser session for this worker"""
+        options = create_chrome_options()
+        if self.warm_profile:
+            self.warm_profile.prepare()
+            self.warm_profile.apply(options)
+        try:
+            self.driver = create_remote_driver(options, self.webdriver_url)
+        except Exception as e:
+            if self.warm_profile:
+                self.warm_profile.recover(e)
+            raise
+        if self.warm_profile:
+            self.warm_profile.started()
+        self.driver.set_page_load_timeout(30)
+        self.driver.set_script_timeout(30)
+        if self.network_profile:
+            apply_network_profile(self.driver, self.network_profile)
+        self.launches += 1
+        print(f"🌐 [{self.name}] Session started: {self.driver.session_id}")
+
+    def stop_session(self):
+        """Quit this worker's browser session"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except:
+                pass
+            self.driver = None
+
+    def visited_origins(self):
+        """Origins the current test touched: open tabs, their subresources and cookie domains"""
+        driver = self.driver
+        origins = set()
+        for handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            origins.update(driver.execute_script("""
+                var origins = [window.location.origin];
+                performance.getEntriesByType('resource').forEach(function (entry) {
+                    try { origins.push(new URL(entry.name).origin); } catch (e) {}
+                });
+                return origins;
+            """) or [])
+        for cookie in execute_cdp(driver, "Network.getAllCookies")["cookies"]:
+            domain = cookie["domain"].lstrip(".")
+            origins.update({f"http://{domain}", f"https://{domain}"})
+        return {o for o in origins if o.startswith(("http://", "https://"))}
+
+    def reset_session(self):
+        """Reset cookies, storage and tabs so the next test starts clean"""
+        driver = self.driver
+        origins = self.visited_origins()
+
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # sessionStorage belongs to the tab, not the origin, so clear it in place
+        driver.execute_script("try { window.sessionStorage.clear(); } catch (e) {}")
+        driver.get("about:blank")
+
+        # Cookies for every domain, then per-origin storage (localStorage,
+        # IndexedDB, Cache Storage, service workers) for each origin seen
+        execute_cdp(driver, "Network.clearBrowserCookies")
+        for origin in origins:
+            execute_cdp(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+    def run(self):
+        while True:
+            # Get a browser before taking a test, so a launch stuck in the hub's
+            # queue doesn't hold a test other workers could be running
+            if not self.driver:
+                if self.tests.empty():
+                    break
+                try:
+                    self.start_session()
+                except Exception as e:
+                    # Leave the remaining tests to workers that have a browser
+                    print(f"⚠️  [{self.name}] Session launch failed, stopping this worker: {e}")
+                    self.launch_error = e
+                    break
+
+            try:
+                name, func = self.tests.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.monotonic()
+            try:
+                outcome = func(driver=self.driver)
+                passed = outcome is not False
+                error = None if passed else "returned False"
+            except Exception as e:
+                passed = False
+                error = str(e)
+            duration = time.monotonic() - start
+
+            status = "✅" if passed else "❌"
+            print(f"{status} [{self.name}] {name} ({duration:.2f}s)")
+            self.results.append((name, passed, duration, error))
+
+            try:
+                self.reset_session()
+            except Exception as e:
+                print(f"⚠️  [{self.name}] Reset failed, relaunching session: {e}")
+                self.stop_session()
+
+            self.tests.task_done()
+
+        self.stop_session()
+
+
+def pool_size(workers, test_count, webdriver_url=WEBDRIVER_URL):
+    """Workers to start: no more than there are tests or free session slots on the hub"""
+    size = min(workers, test_count)
+    try:
+        free, total = free_slots(webdriver_url)
+    except Exception as e:
+        print(f"⚠️  Cannot read hub slots ({e}), starting {size} workers")
+        return size
+    if free < size:
+        # Extra workers would only wait in the hub's new-session queue
+        print(f"⚠️  Only {free} of {total} session slots free, using {max(free, 1)} workers")
+        size = max(free, 1)
+    return size
+
+
+def run_parallel(tests, workers=2, webdriver_url=WEBDRIVER_URL, network_profile=None, warm_profile=False):
+    """Run tests across a fixed pool of reused sessions, returning result tuples"""
+    work = queue.Queue()
+    for test in tests:
+        work.put(test)
+
+    results = []
+    pool = [
+        SessionWorker(i + 1, work, results, webdriver_url, network_profile, warm_profile)
+        for i in range(min(workers, len(tests)))
+    ]
+
+    for worker in pool:
+        worker.start()
+    for worker in pool:
+        worker.join()
+
+    # Every worker failed to launch a browser: report what's left instead of dropping it
+    errors = [worker.launch_error for worker in pool if worker.launch_error]
+    while True:
+        try:
+            name, _ = work.get_nowait()
+        except queue.Empty:
+            break
+        results.append((name, False, 0.0, f"session launch failed: {errors[-1] if errors else 'no worker'}"))
+
+    launches = sum(worker.launches for worker in pool)
+    return results, launches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run driver-based tests in parallel on reused Chrome 97 sessions")
+    parser.add_argument("files", nargs="+", help="Python files containing test_* functions taking a driver")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Number of parallel browser sessions")
+    parser.add_argument("-k", "--pattern", default="test_", help="Test function name prefix")
+    parser.add_argument("--webdriver-url", default=WEBDRIVER_URL)
+    parser.add_argument("--network-profile", choices=list(PROFILES), help="Block/throttle network per session")
+    parser.add_argument("--warm-profile", action="store_true", help="Give each worker a persistent profile/cache")
+    args = parser.parse_args()
+    # Warm profile resets are logged through harness_log
+    setup_logging()
+
+    tests = discover_tests(args.files, args.pattern)
+    if not tests:
+        print("❌ No tests found (test functions must accept a 'driver' argument)")
+        sys.exit(1)
+
+    workers = pool_size(args.workers, len(tests), args.webdriver_url)
+    print(f"🚀 Running {len(tests)} tests on {workers} Chrome 97 sessions")
+    print("=" * 60)
+
+    start = time.monotonic()
+    results, launches = run_parallel(
+        tests, workers, args.webdriver_url, args.network_profile, args.warm_profile
+    )
+    elapsed = time.monotonic() - start
+
+    failed = [r for r in results if not r[1]]
+    print("=" * 60)
+    print(f"📊 {len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.2f}s")
+    print(f"🌐 Browser launches: {launches} for {len(results)} tests")
+    for name, _, _, error in failed:
+        print(f"   ❌ {name}: {error}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+CPU profiling for live Chrome 97 sessions - V8 sampling profiler over CDP
+"""
+
+from cdp import attach_to_session, execute_cdp, list_hub_sessions
+import importlib.util
+import argparse
+import json
+import time
+import sys
+import os
+
+
+def start_profiler(driver, interval_us=100):
+    """Start V8's sampling profiler in the session's current page"""
+    execute_cdp(driver, "Profiler.enable")
+    execute_cdp(driver, "Profiler.setSamplingInterval", {"interval": interval_us})
+    execute_cdp(driver, "Profiler.start")
+
+
+def stop_profiler(driver):
+    """Stop profiling and return the raw CDP Profile object"""
+    profile = execute_cdp(driver, "Profiler.stop")["profile"]
+    execute_cdp(driver, "Profiler.disable")
+    return profile
+
+
+def summarize_profile(profile):
+    """Reduce a CDP profile to per-function self and total time in milliseconds"""
+    nodes = {node["id"]: node for node in profile["nodes"]}
+
+    # Self time: each sample is charged the delta until the next sample
+    self_us = {}
+    samples = profile.get("samples", [])
+    deltas = profile.get("timeDeltas", [])
+    for i, node_id in enumerate(samples):
+        delta = deltas[i + 1] if i + 1 < len(deltas) else 0
+        self_us[node_id] = self_us.get(node_id, 0) + max(0, delta)
+
+    def key_for(node):
+        frame = node["callFrame"]
+        name = frame.get("functionName") or "(anonymous)"
+        url = frame.get("url") or ""
+        location = f"{os.path.basename(url)}:{frame.get('lineNumber', 0) + 1}" if url else ""
+        return (name, location)
+
+    functions = {}
+    root = profile["nodes"][0]["id"]
+
+    # Iterative DFS; a function's total is only counted at its outermost frame
+    # on the stack so recursion is not double counted
+    subtree_us = {}
+    stack = [(root, False)]
+    order = []
+    while stack:
+        node_id, visited = stack.pop()
+        if visited:
+            order.append(node_id)
+            continue
+        stack.append((node_id, True))
+        for child in nodes[node_id].get("children", []):
+            stack.append((child, False))
+    for node_id in order:
+        subtree_us[node_id] = self_us.get(node_id, 0) + sum(
+            subtree_us[child] for child in nodes[node_id].get("children", [])
+        )
+
+    active = {}
+    stack = [(root, False)]
+    while stack:
+        node_id, leaving = stack.pop()
+        key = key_for(nodes[node_id])
+        if leaving:
+            active[key] -= 1
+            continue
+        entry = functions.setdefault(key, {"self_ms": 0.0, "total_ms": 0.0})
+        entry["self_ms"] += self_us.get(node_id, 0) / 1000
+        if not active.get(key):
+            entry["total_ms"] += subtree_us[node_id] / 1000
+        active[key] = active.get(key, 0) + 1
+        stack.append((node_id, True))
+        for child in nodes[node_id].get("children", []):
+            stack.append((child, False))
+
+    duration_ms = (profile.get("endTime", 0) - profile.get("startTime", 0)) / 1000
+    return functions, duration_ms
+
+
+def print_summary(functions, duration_ms, top=20):
+    """Print the top-N hot functions by self time and by total time"""
+    # The synthetic root frame's total is the whole profile, which says nothing
+    functions = {k: v for k, v in functions.items() if k[0] != "(root)"}
+    print(f"⏱️  Profile duration: {duration_ms:.0f}ms")
+    for label, field in (("🔥 Top self time", "self_ms"), ("🌲 Top total time", "total_ms")):
+        print(f"{label}:")
+        rows = sorted(functions.items(), key=lambda item: item[1][field], reverse=True)[:top]
+        for (name, location), times in rows:
+            share = times[field] / duration_ms * 100 if duration_ms else 0.0
+            print(f"   {times[field]:9.1f}ms {share:5.1f}%  {name} {location}")
+
+
+def load_flow(path):
+    """Load a scripted flow: a Python file defining flow(driver)"""
+    spec = importlib.util.spec_from_file_location("profile_flow", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.flow
+
+
+def write_profile(profile, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    print(f"💾 Raw profile written to {path} (open in DevTools > Performance)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the frontend in live Chrome 97 sessions")
+    parser.add_argument("--session", action="append", help="Session id to attach to (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Profile every session on the hub at once")
+    parser.add_argument("--seconds", type=float, default=10, help="Profiling window length")
+    parser.add_argument("--flow", help="Python file with flow(driver) to run while profiling (single session)")
+    parser.add_argument("--interval", type=int, default=100, help="Sampling interval in microseconds")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", default="chrome97", help="Output file prefix for .cpuprofile files")
+    parser.add_argument("--webdriver-url", default="http://localhost:4444/wd/hub")
+    args = parser.parse_args()
+
+    session_ids = args.session or []
+    if args.all or not session_ids:
+        try:
+            hub_sessions = list_hub_sessions(args.webdriver_url)
+        except Exception as e:
+            print(f"❌ Cannot list hub sessions: {e}")
+            sys.exit(1)
+        for session_id, version in hub_sessions:
+            print(f"🔗 Found session {session_id} (Chrome {version})")
+        hub_ids = [session_id for session_id, _ in hub_sessions]
+        session_ids = hub_ids if args.all else hub_ids[:1]
+
+    if not session_ids:
+        print("❌ No live sessions. Start one with run_forever.py or connect_to_frontend.py")
+        sys.exit(1)
+    if args.flow and len(session_ids) > 1:
+        print("❌ --flow profiles a single session; pass one --session")
+        sys.exit(1)
+
+    drivers = {session_id: attach_to_session(session_id, args.webdriver_url) for session_id in session_ids}
+
+    # Only profilers that actually started are stopped below; a session that
+    # ended since the hub listed it is skipped instead of aborting the batch
+    profiling = {}
+    try:
+        # Start every profiler first so batch profiles cover the same window
+        for session_id, driver in drivers.items():
+            try:
+                start_profiler(driver, args.interval)
+            except Exception as e:
+                print(f"⚠️  Skipping {session_id}: could not start profiler: {e}")
+                continue
+            profiling[session_id] = driver
+            print(f"🎬 Profiling {session_id}...")
+        if not profiling:
+            print("❌ No profiler could be started")
+            sys.exit(1)
+
+        if args.flow:
+            flow = load_flow(args.flow)
+            print(f"▶️  Running flow from {args.flow}")
+            flow(next(iter(profiling.values())))
+        else:
+            time.sleep(args.seconds)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping early")
+    finally:
+        for session_id, driver in profiling.items():
+            try:
+                profile = stop_profiler(driver)
+            except Exception as e:
+                print(f"❌ Could not stop profiler in {session_id}: {e}")
+                continue
+            print("=" * 60)
+            print(f"📊 Session {session_id}")
+            write_profile(profile, f"{args.out}-{session_id[:8]}.cpuprofile")
+            functions, duration_ms = summarize_profile(profile)
+            print_summary(functions, duration_ms, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Shared retry policy - jittered exponential backoff, readiness short-circuit and a circuit breaker
+"""
+
+# How a connect loop uses it:
+#
+#     policy = RetryPolicy("forever", max_attempts=10)
+#     if not policy.allow():          # node known-down: waits for a trial (fail_fast=True: says stop)
+#         return False
+#     for attempt in range(policy.max_attempts):
+#         try:
+#             ...connect...
+#             policy.succeeded(attempt)
+#             return True
+#         except Exception as e:
+#             if not policy.wait(attempt, e):   # sleeps, or says stop
+#                 return False
+#
+# Every decision is logged with extra={"event": "retry_decision", ...}; waits
+# are logged once they end, with the planned delay_s and the actual waited_s,
+# so the JSON-lines log (--log-file) shows how long each schedule really took.
+import threading
+import logging
+import random
+import time
+
+from hub_monitor import get_coordinator
+from harness_log import get_logger
+from tracing import span
+
+log = get_logger("retry")
+
+
+class CircuitBreaker:
+    """Opens after consecutive failed attempts with the node down, so callers fail fast
+
+    closed    -> normal operation
+    open      -> the node is known to be down; allow() is False until ``reset_after``
+                 (or until the hub reports ready, see RetryPolicy.allow)
+    half-open -> attempts are let through again; another node-down failure
+                 re-opens the breaker for twice as long, a reachable node closes it
+    """
+
+    def __init__(self, threshold=3, reset_after=60.0, max_reset_after=300.0):
+        self.threshold = threshold
+        self.base_reset_after = reset_after
+        self.reset_after = reset_after
+        self.max_reset_after = max_reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at < self.reset_after:
+                return "open"
+            return "half-open"
+
+    def allow(self):
+        return self.state != "open"
+
+    def node_down(self):
+        with self.lock:
+            self.failures += 1
+            if self.opened_at is not None:
+                if time.monotonic() - self.opened_at >= self.reset_after:
+                    # Failed half-open trial: open again, backing off the trials too
+                    self.reset_after = min(self.max_reset_after, self.reset_after * 2)
+                    self.opened_at = time.monotonic()
+            elif self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                log.error(f"🔌 Circuit open: node down {self.failures} times in a row, "
+                          f"no attempts for {self.reset_after:.0f}s",
+                          extra={"event": "circuit_open", "failures": self.failures})
+
+    def half_open(self):
+        """Let a trial attempt through now instead of waiting out ``reset_after``"""
+        with self.lock:
+            if self.opened_at is not None:
+                self.opened_at = min(self.opened_at, time.monotonic() - self.reset_after)
+
+    def node_up(self):
+        with self.lock:
+            if self.opened_at is not None:
+                log.info("🔌 Circuit closed: node reachable again", extra={"event": "circuit_closed"})
+            self._close()
+
+    def reset(self, reason):
+        """Forget past failures, e.g. after the container was restarted"""
+        with self.lock:
+            if self.opened_at is not None or self.failures:
+                log.info(f"🔌 Circuit reset: {reason}", extra={"event": "circuit_reset"})
+            self._close()
+
+    def _close(self):
+        self.failures = 0
+        self.opened_at = None
+        self.reset_after = self.base_reset_after
+
+
+_breakers = {}
+_breakers_guard = threading.Lock()
+
+
+def get_breaker(webdriver_url):
+    """One breaker per hub, shared by every policy in the process"""
+    with _breakers_guard:
+        if webdriver_url not in _breakers:
+            _breakers[webdriver_url] = CircuitBreaker()
+        return _breakers[webdriver_url]
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait after a failed attempt"""
+
+    def __init__(self, name, max_attempts=10, base_delay=2.0, max_delay=60.0, multiplier=2.0,
+                 ready_poll=2.0, coordinator=None, heartbeat=None, fail_fast=False):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.ready_poll = ready_poll
+        # Called every ready_poll seconds while waiting, e.g. a status board heartbeat
+        self.heartbeat = heartbeat or (lambda: None)
+        # Only callers with a fallback should give up while the breaker is open;
+        # everyone else waits it out, so a booting hub doesn't end the run
+        self.fail_fast = fail_fast
+        self.coordinator = coordinator or get_coordinator()
+        self.breaker = get_breaker(self.coordinator.webdriver_url)
+
+    def backoff(self, attempt):
+        """Full jitter: uniform between 0 and the exponential cap for this attempt"""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return random.uniform(0, cap)
+
+    def _record(self, level, message, attempt, decision, **fields):
+        log.log(level, message, extra=dict(fields, event="retry_decision", policy=self.name,
+                                           attempt=attempt + 1, decision=decision, breaker=self.breaker.state))
+
+    def allow(self):
+        """Whether to make the first attempt while the breaker may be open
+
+        Only the coordinator's cached status is consulted, so an open breaker
+        still costs at most one /status query per TTL across all instances.
+        With ``fail_fast`` an open breaker returns False at once; otherwise
+        this waits for a trial (see wait_while_open) and returns True.
+        """
+        if self.breaker.allow():
+            return True
+        if self.coordinator.hub()["ready"]:
+            self.breaker.half_open()
+            self._record(logging.INFO, "🔌 Hub reports ready, letting a trial attempt through", -1, "half_open")
+            return True
+        if self.fail_fast:
+            self._record(logging.WARNING, f"🔌 Node known to be down, not connecting "
+                         f"(next trial within {self.breaker.reset_after:.0f}s)", -1, "circuit_open")
+            return False
+        return self.wait_while_open(-1)
+
+    def wait_while_open(self, attempt, error=None):
+        """Sleep until the breaker goes half-open or /status reports ready; returns True"""
+        self._record(logging.WARNING, f"🔌 Node is down, waiting up to {self.breaker.reset_after:.0f}s "
+                     f"for a trial attempt...", attempt, "circuit_open", error=error)
+        start = time.monotonic()
+        with span("circuit_open_wait") as s:
+            while not self.breaker.allow():
+                time.sleep(self.ready_poll)
+                self.heartbeat()
+                if self.coordinator.hub(self.ready_poll)["ready"]:
+                    self.breaker.half_open()
+            waited = time.monotonic() - start
+            s.set("waited_s", round(waited, 2))
+        self._record(logging.INFO, f"🔌 Trial attempt after {waited:.1f}s", attempt, "half_open",
+                     waited_s=round(waited, 2))
+        return True
+
+    def succeeded(self, attempt):
+        self.breaker.node_up()
+        self._record(logging.DEBUG, f"🎲 {self.name}: connected on attempt {attempt + 1}", attempt, "success")
+
+    def wait(self, attempt, error=None):
+        """After a failed attempt: sleep and return True to retry, or return False to stop"""
+        error = str(error) if error else None
+        hub = self.coordinator.hub()
+        if hub["reachable"]:
+            self.breaker.node_up()
+        else:
+            self.breaker.node_down()
+
+        if attempt + 1 >= self.max_attempts:
+            self._record(logging.ERROR, "💥 All connection attempts failed!", attempt, "give_up", error=error)
+            return False
+        if not self.breaker.allow():
+            if self.fail_fast:
+                self._record(logging.ERROR, "💥 Node is down, failing fast until the circuit resets",
+                             attempt, "circuit_open", error=error)
+                return False
+            # Node down: sit out the open circuit instead of spending attempts on it
+            return self.wait_while_open(attempt, error)
+
+        delay = self.backoff(attempt)
+        log.info(f"⏳ Waiting up to {delay:.1f}s before retry...")
+        start = time.monotonic()
+        with span("backoff", delay_s=round(delay, 2), hub_ready=hub["ready"]) as s:
+            while time.monotonic() - start < delay:
+                time.sleep(max(0.0, min(self.ready_poll, delay - (time.monotonic() - start))))
+                self.heartbeat()
+                # Hub busy or down: cut the wait short as soon as /status says ready
+                if not hub["ready"] and self.coordinator.hub(self.ready_poll)["ready"]:
+                    waited = time.monotonic() - start
+                    s.set("short_circuit_s", round(waited, 2))
+                    self._record(logging.INFO, f"⚡ Hub ready after {waited:.1f}s, retrying now", attempt,
+                                 "ready_short_circuit", delay_s=round(delay, 2), waited_s=round(waited, 2))
+                    return True
+        waited = time.monotonic() - start
+        self._record(logging.INFO, f"🔁 Waited {waited:.1f}s, retrying now", attempt, "backoff",
+                     delay_s=round(delay, 2), waited_s=round(waited, 2), hub_ready=hub["ready"], error=error)
+        return True
@@ -3,120 +3,184 @@
 INFINITE Chrome 97 session - Runs FOREVER with bulletproof recovery!
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import WebDriverException, TimeoutException
 import time
 import datetime
 import sys
 import signal
-import os
+import argparse
+
+import chrome_options
+from cdp import create_remote_driver
+from network_capture import NetworkCapture, enable_performance_log
+from network_profiles import PROFILES, apply_network_profile
+from warm_profile import WarmProfile, profile_name
+from page_readiness import READY_MODES, SCRIPT_HEADROOM, parse_ready_modes, wait_for_page_ready
+from harness_log import get_logger, setup_logging
+from status_board import StatusPublisher
+from hub_monitor import get_coordinator
+from tracing import current_span, setup_tracing, span, traced
+from retry_policy import RetryPolicy, get_breaker
+
+log = get_logger("forever")
+
+# Session script timeout: the 30s readiness wait plus the headroom it needs
+SCRIPT_TIMEOUT = 30 + SCRIPT_HEADROOM
 
 class ForeverChrome:
-    def __init__(self, port=3000):
+    def __init__(self, port=3000, har_path=None, network_profile=None, warm_profile=None,
+                 ready_modes=("load",)):
         self.port = port
         self.frontend_url = f"http://host.docker.internal:{port}"
         self.driver = None
         self.start_time = datetime.datetime.now()
         self.reconnect_count = 0
+        self.health_failures = 0
         self.total_uptime = 0
         self.running = True
         
+        # Optional network capture (streams a HAR file across reconnects)
+        self.network_capture = NetworkCapture(har_path) if har_path else None
+        self.network_profile = network_profile
+        
+        # Optional persistent profile so reconnects hit a warm HTTP cache
+        self.warm_profile = WarmProfile(warm_profile) if warm_profile else None
+        
+        # What "page loaded" means for this app (see page_readiness.py)
+        self.ready_modes = ready_modes
+        
+        # Shared, cached hub/container checks (one check per outage across instances)
+        self.hub_monitor = get_coordinator()
+        self.last_failure_at = None
+        
+        # Live status for `chrome97.py status` (shared-memory, see status_board.py)
+        try:
+            self.status_board = StatusPublisher(port)
+        except Exception as e:
+            log.warning(f"⚠️  Status board unavailable: {e}")
+            self.status_board = None
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
-        print(f"\n🛑 Received shutdown signal ({signum})")
+        log.info(f"\n🛑 Received shutdown signal ({signum})")
         self.running = False
         self.cleanup()
         sys.exit(0)
     
+    def publish_status(self, **fields):
+        """Update this instance's slot on the status board"""
+        if self.status_board:
+            self.status_board.publish(**fields)
+    
     def create_chrome_options(self):
         """Create bulletproof Chrome options"""
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1600,1000')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-plugins')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--disable-background-timer-throttling')
-        options.add_argument('--disable-backgrounding-occluded-windows')
-        options.add_argument('--disable-renderer-backgrounding')
-        options.add_argument('--disable-background-networking')
-        options.add_argument('--no-first-run')
-        options.add_argument('--no-default-browser-check')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
+        options = chrome_options.create_chrome_options("forever")
+        
+        if self.network_capture:
+            enable_performance_log(options)
         
-        # Keep browser alive
-        options.add_argument('--keep-alive-for-test')
-        options.add_argument('--disable-hang-monitor')
+        if self.warm_profile:
+            self.warm_profile.apply(options)
         
         return options
     
+    @traced()
     def connect_with_retry(self, max_retries=10):
-        """Connect to Chrome with aggressive retry logic"""
+        """Connect to Chrome with jittered exponential backoff (see retry_policy.py)"""
+        from selenium.common.exceptions import WebDriverException
+        
+        policy = RetryPolicy("forever", max_attempts=max_retries, coordinator=self.hub_monitor,
+                             heartbeat=self.publish_status)
+        if not policy.allow():
+            return False
+        
         for attempt in range(max_retries):
-            try:
-                print(f"🔄 Connection attempt {attempt + 1}/{max_retries}...")
-                
-                options = self.create_chrome_options()
-                self.driver = webdriver.Remote(
-                    command_executor="http://localhost:4444/wd/hub",
-                    options=options
-                )
-                
-                # Configure timeouts
-                self.driver.implicitly_wait(10)
-                self.driver.set_page_load_timeout(30)
-                self.driver.set_script_timeout(30)
-                
-                # Remove automation indicators
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                
-                print(f"📱 Navigating to {self.frontend_url}...")
-                self.driver.get(self.frontend_url)
-                
-                # Wait for page to load
-                WebDriverWait(self.driver, 30).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                
-                title = self.driver.title
-                print(f"✅ Connected! Page title: {title}")
-                return True
-                
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed: {e}")
-                if self.driver:
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    self.driver = None
-                
-                if attempt < max_retries - 1:
-                    wait_time = min(30, (attempt + 1) * 5)  # Progressive backoff
-                    print(f"⏳ Waiting {wait_time} seconds before retry...")
-                    time.sleep(wait_time)
-                else:
-                    print("💥 All connection attempts failed!")
-                    return False
+            attempt_started_at = time.time()
+            with span("connect_attempt", attempt=attempt + 1) as attempt_span:
+                try:
+                    log.info(f"🔄 Connection attempt {attempt + 1}/{max_retries}...",
+                             extra={"event": "connect_attempt", "attempt": attempt + 1})
+                    self.publish_status(state="connecting")
+                    
+                    # Fail fast while the hub is known to be down (cached, shared with other instances)
+                    with span("hub_probe"):
+                        hub = self.hub_monitor.hub()
+                    if not hub["reachable"]:
+                        raise WebDriverException(f"WebDriver hub unreachable: {hub['error']}")
+                    
+                    if self.warm_profile:
+                        self.warm_profile.prepare()
+                    
+                    options = self.create_chrome_options()
+                    with span("create_session"):
+                        try:
+                            self.driver = create_remote_driver(options)
+                        except Exception as e:
+                            # A locked or corrupted profile stops Chrome from starting
+                            if self.warm_profile:
+                                self.warm_profile.recover(e)
+                            raise
+                    
+                    self.publish_status()
+                    if self.warm_profile:
+                        self.warm_profile.started()
+                    if self.network_capture:
+                        self.network_capture.new_session()
+                    
+                    # Configure timeouts
+                    self.driver.implicitly_wait(10)
+                    self.driver.set_page_load_timeout(30)
+                    self.driver.set_script_timeout(SCRIPT_TIMEOUT)
+                    
+                    # Remove automation indicators
+                    self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                    
+                    # Re-apply network blocking/throttling on every new session
+                    if self.network_profile:
+                        apply_network_profile(self.driver, self.network_profile)
+                        log.info(f"🌐 Network profile: {self.network_profile}")
+                    
+                    log.info(f"📱 Navigating to {self.frontend_url}...")
+                    with span("navigate", url=self.frontend_url):
+                        self.driver.get(self.frontend_url)
+                    self.publish_status()
+                    
+                    # Wait for page to load
+                    with span("wait_ready", modes=",".join(self.ready_modes)):
+                        wait_for_page_ready(self.driver, 30, modes=self.ready_modes, script_timeout=SCRIPT_TIMEOUT)
+                    
+                    title = self.driver.title
+                    policy.succeeded(attempt)
+                    self.publish_status(state="connected", session_id=self.driver.session_id, url=self.frontend_url)
+                    log.info(f"✅ Connected! Page title: {title}",
+                             extra={"event": "connected", "session_id": self.driver.session_id, "title": title})
+                    return True
+                    
+                except Exception as e:
+                    log.error(f"❌ Attempt {attempt + 1} failed: {e}",
+                              extra={"event": "connect_failed", "attempt": attempt + 1})
+                    attempt_span.set("error", str(e))
+                    self.hub_monitor.invalidate("hub", observed_at=attempt_started_at)
+                    if self.driver:
+                        try:
+                            self.driver.quit()
+                        except:
+                            pass
+                        self.driver = None
+                    
+                    if not policy.wait(attempt, e):
+                        return False
         
         return False
     
+    @traced()
     def keep_session_alive(self):
         """Advanced session keep-alive with health checks"""
+        from selenium.common.exceptions import WebDriverException
+        
         try:
             # Multi-level health check
             
@@ -132,12 +196,14 @@ class ForeverChrome:
             # 3. Check current URL
             current_url = self.driver.current_url
             if not current_url or "data:" in current_url:
-                print(f"🔄 Invalid URL detected: {current_url}")
-                self.driver.get(self.frontend_url)
-                time.sleep(2)
+                log.info(f"🔄 Invalid URL detected: {current_url}")
+                with span("renavigate", from_url=current_url):
+                    self.driver.get(self.frontend_url)
+                    wait_for_page_ready(self.driver, 10, modes=self.ready_modes, script_timeout=SCRIPT_TIMEOUT)
             
             # 4. Execute JavaScript to keep session active
-            result = self.driver.execute_script("""
+            with span("keepalive_script"):
+                result = self.driver.execute_script("""
                 // Keep session alive
                 try {
                     // Touch the DOM
@@ -158,84 +224,102 @@ class ForeverChrome:
                 } catch (e) {
                     return {error: e.toString()};
                 }
-            """)
+                """)
             
             if result and 'error' not in result:
                 return True
             else:
-                print(f"⚠️  JavaScript health check failed: {result}")
+                log.warning(f"⚠️  JavaScript health check failed: {result}")
+                current_span().set("error", str(result))
                 return False
                 
         except WebDriverException as e:
-            print(f"⚠️  Session health check failed: {e}")
+            log.warning(f"⚠️  Session health check failed: {e}")
+            current_span().set("error", str(e))
             return False
         except Exception as e:
-            print(f"⚠️  Unexpected error in health check: {e}")
+            log.warning(f"⚠️  Unexpected error in health check: {e}")
+            current_span().set("error", str(e))
             return False
     
+    def poll_network_capture(self):
+        """Drain pending network events into the HAR file and stats"""
+        if not self.network_capture or not self.driver:
+            return
+        try:
+            self.network_capture.poll(self.driver)
+        except Exception as e:
+            log.warning(f"⚠️  Network capture poll failed: {e}")
+    
+    @traced()
     def restart_container_if_needed(self):
         """Restart Selenium container if it's unresponsive"""
         try:
-            print("🔄 Checking Selenium container status...")
-            result = os.system("docker-compose ps selenium-chrome | grep -q 'Up'")
+            log.info("🔄 Checking Selenium container status...")
+            # Status checked before the failed health check can't be trusted
+            self.hub_monitor.invalidate(observed_at=self.last_failure_at)
             
-            if result != 0:
-                print("🚨 Container is down! Restarting...")
-                os.system("docker-compose restart selenium-chrome")
-                time.sleep(15)  # Wait for container to be ready
-                return True
+            with span("container_status") as status_span:
+                container_up = self.hub_monitor.container_up()
+                status_span.set("up", container_up)
+            if not container_up:
+                log.error("🚨 Container is down! Restarting...")
+            else:
+                # Check if WebDriver endpoint is responsive
+                with span("hub_status") as status_span:
+                    hub = self.hub_monitor.hub()
+                    status_span.set("reachable", hub["reachable"])
+                if hub["reachable"]:
+                    return False
+                log.error(f"🚨 WebDriver endpoint unreachable ({hub['error']})! Restarting container...")
             
-            # Check if WebDriver endpoint is responsive
-            import requests
-            try:
-                response = requests.get("http://localhost:4444/wd/hub/status", timeout=10)
-                if response.status_code != 200:
-                    print("🚨 WebDriver not responsive! Restarting container...")
-                    os.system("docker-compose restart selenium-chrome")
-                    time.sleep(15)
-                    return True
-            except:
-                print("🚨 WebDriver endpoint unreachable! Restarting container...")
-                os.system("docker-compose restart selenium-chrome")
-                time.sleep(15)
-                return True
+            with span("container_restart") as restart_span:
+                restarted = self.hub_monitor.restart_container()
+                restart_span.set("restarted_here", restarted)
+            if restarted:
+                # Failures seen before the restart say nothing about the new container
+                get_breaker(self.hub_monitor.webdriver_url).reset("container restarted")
+            with span("restart_wait", wait_s=15):
+                time.sleep(15)  # Wait for container to be ready
+            return True
                 
         except Exception as e:
-            print(f"⚠️  Container check failed: {e}")
+            log.warning(f"⚠️  Container check failed: {e}")
         
         return False
     
     def run_forever(self):
         """Main infinite loop - RUNS FOREVER!"""
         
-        print("🚀 STARTING INFINITE CHROME 97 SESSION!")
-        print("=" * 60)
-        print(f"📍 URL: {self.frontend_url}")
-        print(f"🖥️ Watch in noVNC: http://localhost:7900")
-        print(f"⏰ Started at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print("🔄 Will run FOREVER until manually stopped!")
-        print("=" * 60)
+        log.info("🚀 STARTING INFINITE CHROME 97 SESSION!")
+        log.info("=" * 60)
+        log.info(f"📍 URL: {self.frontend_url}")
+        log.info(chrome_options.watch_hint("forever"))
+        log.info(f"⏰ Started at: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        log.info("🔄 Will run FOREVER until manually stopped!")
+        log.info("=" * 60)
         
         # Initial connection
         if not self.connect_with_retry():
-            print("💥 Failed to establish initial connection!")
+            log.error("💥 Failed to establish initial connection!")
             return
         
-        print("\n🎮 Chrome 97 is now connected FOREVER!")
-        print("🖥️ Go to http://localhost:7900 to interact with it")
-        print("⌨️ Features:")
-        print("   • INFINITE runtime - never stops!")
-        print("   • Auto-reconnection every 30 seconds")
-        print("   • Container restart on failure")
-        print("   • Progressive retry backoff")
-        print("   • Advanced health monitoring")
-        print("   • Bulletproof error recovery")
-        print("\n🛑 Press Ctrl+C to stop (only way to stop!)")
-        print("=" * 60)
+        log.info("\n🎮 Chrome 97 is now connected FOREVER!")
+        log.info(chrome_options.watch_hint("forever"))
+        log.info("⌨️ Features:")
+        log.info("   • INFINITE runtime - never stops!")
+        log.info("   • Auto-reconnection every 30 seconds")
+        log.info("   • Container restart on failure")
+        log.info("   • Jittered exponential backoff with circuit breaker")
+        log.info("   • Advanced health monitoring")
+        log.info("   • Bulletproof error recovery")
+        log.info("\n🛑 Press Ctrl+C to stop (only way to stop!)")
+        log.info("=" * 60)
         
         loop_count = 0
         last_health_check = time.time()
         last_status_report = time.time()
+        last_network_poll = time.time()
         
         # INFINITE LOOP - RUNS FOREVER!
         while self.running:
@@ -243,32 +327,50 @@ class ForeverChrome:
                 loop_count += 1
                 current_time = time.time()
                 
+                # Drain network events every 5 seconds so the browser-side log stays small
+                if self.network_capture and current_time - last_network_poll >= 5:
+                    self.poll_network_capture()
+                    last_network_poll = current_time
+                
                 # Health check every 30 seconds
                 if current_time - last_health_check >= 30:
-                    if not self.keep_session_alive():
-                        print(f"🚨 Health check failed! Attempting recovery...")
-                        
-                        # Try to reconnect
-                        if self.driver:
-                            try:
-                                self.driver.quit()
-                            except:
-                                pass
-                            self.driver = None
-                        
-                        # Check if container needs restart
-                        self.restart_container_if_needed()
+                    probe_start = time.monotonic()
+                    probe_started_at = time.time()
+                    healthy = self.keep_session_alive()
+                    self.publish_status(last_probe_ms=(time.monotonic() - probe_start) * 1000)
+                    if not healthy:
+                        log.error("🚨 Health check failed! Attempting recovery...", extra={"event": "health_failed"})
+                        self.health_failures += 1
+                        self.last_failure_at = probe_started_at
+                        self.publish_status(state="recovering", health_failures=self.health_failures)
                         
-                        # Reconnect
-                        if self.connect_with_retry():
-                            self.reconnect_count += 1
-                            print(f"✅ Recovered successfully! (Recovery #{self.reconnect_count})")
-                        else:
-                            print("💥 Recovery failed! Trying container restart...")
+                        with span("recovery", recovery=self.reconnect_count + 1):
+                            # Try to reconnect
+                            self.poll_network_capture()
+                            if self.driver:
+                                try:
+                                    self.driver.quit()
+                                except:
+                                    pass
+                                self.driver = None
+                            
+                            # Check if container needs restart
                             self.restart_container_if_needed()
+                            
+                            # Reconnect
                             if self.connect_with_retry():
                                 self.reconnect_count += 1
-                                print(f"✅ Recovered after container restart! (Recovery #{self.reconnect_count})")
+                                self.publish_status(recoveries=self.reconnect_count)
+                                log.info(f"✅ Recovered successfully! (Recovery #{self.reconnect_count})",
+                                         extra={"event": "recovered", "recovery": self.reconnect_count})
+                            else:
+                                log.error("💥 Recovery failed! Trying container restart...")
+                                self.restart_container_if_needed()
+                                if self.connect_with_retry():
+                                    self.reconnect_count += 1
+                                    self.publish_status(recoveries=self.reconnect_count)
+                                    log.info(f"✅ Recovered after container restart! (Recovery #{self.reconnect_count})",
+                                             extra={"event": "recovered", "recovery": self.reconnect_count})
                     
                     last_health_check = current_time
                 
@@ -285,26 +387,43 @@ class ForeverChrome:
                         current_url = "Session error"
                         session_id = "None"
                     
-                    print(f"📊 FOREVER SESSION STATUS:")
-                    print(f"   ⏰ Uptime: {hours}h {minutes}m")
-                    print(f"   🔄 Recoveries: {self.reconnect_count}")
-                    print(f"   🔗 Session ID: {session_id}")
-                    print(f"   📍 URL: {current_url}")
-                    print(f"   🔢 Loop: {loop_count}")
+                    status = [
+                        "📊 FOREVER SESSION STATUS:",
+                        f"   ⏰ Uptime: {hours}h {minutes}m",
+                        f"   🔄 Recoveries: {self.reconnect_count}",
+                        f"   🔗 Session ID: {session_id}",
+                        f"   📍 URL: {current_url}",
+                        f"   🔢 Loop: {loop_count}",
+                    ]
+                    if self.network_capture:
+                        status.append(f"   📡 Network events: {self.network_capture.events_seen}")
+                    log.info("\n".join(status), extra={
+                        "event": "status",
+                        "uptime_s": int(uptime.total_seconds()),
+                        "recoveries": self.reconnect_count,
+                        "session_id": session_id,
+                        "url": current_url,
+                        "loop": loop_count,
+                    })
+                    if self.network_capture:
+                        self.network_capture.stats.report(top=5, emit=log.info)
                     
                     last_status_report = current_time
                 
+                # Heartbeat so readers can tell a live instance from a hung one
+                self.publish_status()
+                
                 # Sleep for 1 second
                 time.sleep(1)
                 
             except KeyboardInterrupt:
-                print("\n🛑 Stopping infinite session...")
+                log.info("\n🛑 Stopping infinite session...")
                 self.running = False
                 break
                 
             except Exception as e:
-                print(f"💥 Unexpected error in main loop: {e}")
-                print("🔄 Continuing anyway (FOREVER mode!)...")
+                log.error(f"💥 Unexpected error in main loop: {e}")
+                log.info("🔄 Continuing anyway (FOREVER mode!)...")
                 time.sleep(5)
         
         # Final cleanup
@@ -315,28 +434,58 @@ class ForeverChrome:
         end_time = datetime.datetime.now()
         total_runtime = end_time - self.start_time
         
-        print(f"\n🏁 INFINITE SESSION ENDED")
-        print(f"⏰ Total runtime: {total_runtime}")
-        print(f"🔄 Total recoveries: {self.reconnect_count}")
+        log.info(f"\n🏁 INFINITE SESSION ENDED")
+        log.info(f"⏰ Total runtime: {total_runtime}")
+        log.info(f"🔄 Total recoveries: {self.reconnect_count}")
+        
+        if self.network_capture:
+            self.poll_network_capture()
+            self.network_capture.close()
+            if self.network_capture.writer:
+                log.info(f"💾 HAR written: {self.network_capture.writer.path} ({self.network_capture.writer.entry_count} entries)")
         
         if self.driver:
             try:
                 self.driver.quit()
-                print("🔚 Browser session closed")
+                log.info("🔚 Browser session closed")
             except:
-                print("🔚 Browser session cleanup completed")
+                log.info("🔚 Browser session cleanup completed")
+        
+        if self.status_board:
+            self.status_board.close()
+            self.status_board = None
 
 def main():
     """Main function"""
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    parser = argparse.ArgumentParser(description="Run a Chrome 97 session forever with auto-recovery")
+    parser.add_argument("port", nargs="?", type=int, default=3000)
+    parser.add_argument("--har", help="Stream captured network activity to this HAR file")
+    parser.add_argument("--network-profile", choices=list(PROFILES), help="Block/throttle network per session")
+    parser.add_argument("--warm-profile", metavar="NAME", type=profile_name, help="Reuse a persistent browser profile/cache across reconnects")
+    parser.add_argument("--log-file", help="Write JSON-lines logs here (size-rotated)")
+    parser.add_argument("--log-level", help="DEBUG, INFO, WARNING or ERROR (default INFO)")
+    parser.add_argument("--quiet", action="store_true", help="No console output (log file only)")
+    parser.add_argument("--ready", default=("load",), type=parse_ready_modes,
+                        help=f"Comma-separated readiness conditions ({', '.join(READY_MODES)})")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write connect/health/recovery spans as Chrome trace-event JSON")
+    args = parser.parse_args()
+    setup_logging(log_file=args.log_file, level=args.log_level, console=not args.quiet)
+    setup_tracing(args.trace, process_name=f"run_forever :{args.port}")
     
-    print("🌟 CHROME 97 FOREVER MODE")
-    print("=" * 40)
-    print("⚠️  WARNING: This will run FOREVER!")
-    print("🛑 Only way to stop: Ctrl+C")
-    print("=" * 40)
+    log.info("🌟 CHROME 97 FOREVER MODE")
+    log.info("=" * 40)
+    log.warning("⚠️  WARNING: This will run FOREVER!")
+    log.info("🛑 Only way to stop: Ctrl+C")
+    log.info("=" * 40)
     
-    forever_chrome = ForeverChrome(port)
+    forever_chrome = ForeverChrome(
+        args.port,
+        har_path=args.har,
+        network_profile=args.network_profile,
+        warm_profile=args.warm_profile,
+        ready_modes=args.ready
+    )
     forever_chrome.run_forever()
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Low-bandwidth viewer for Chrome 97 sessions - streams only the page viewport as JPEG
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from cdp import attach_to_session, execute_cdp, list_hub_sessions
+from harness_log import get_logger, setup_logging
+import threading
+import argparse
+import hashlib
+import base64
+import json
+import time
+import sys
+
+log = get_logger("screencast")
+
+BOUNDARY = "chrome97frame"
+# A still page sends no frames, so a viewer that went away would only be
+# noticed on the next change. Resending the last frame this often makes a dead
+# socket fail the write (or time out) and frees its viewer slot.
+KEEPALIVE_SECONDS = 10
+
+VIEWER_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Chrome 97 Viewer</title>
+    <style>
+        body { margin: 0; background: #222; color: #ccc; font-family: Arial, sans-serif; }
+        #bar { padding: 6px 10px; font-size: 12px; }
+        img { display: block; max-width: 100%; margin: 0 auto; }
+    </style>
+</head>
+<body>
+    <div id="bar">Chrome 97 session {session} - viewport only</div>
+    <img src="/stream.mjpg" alt="Chrome 97 viewport">
+    <script>
+        setInterval(function () {
+            fetch('/stats').then(function (r) { return r.json(); }).then(function (s) {
+                document.getElementById('bar').textContent =
+                    'Chrome 97 session {session} | ' + s.viewers + ' viewer(s) | ' + s.fps.toFixed(1) +
+                    ' fps | q' + s.quality + ' | ' + (s.kbps).toFixed(0) + ' kbps';
+            });
+        }, 2000);
+    </script>
+</body>
+</html>
+"""
+
+
+class FrameBroadcaster:
+    """Captures viewport JPEGs once and hands the same bytes to every viewer"""
+
+    def __init__(self, driver, max_fps=5, max_kbps=1000, scale=1.0, min_quality=30, max_quality=80):
+        self.driver = driver
+        self.max_fps = max_fps
+        self.max_kbps = max_kbps
+        self.scale = scale
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.quality = max_quality
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.sequence = 0
+        self.viewers = 0
+        self.running = True
+        self.fps = 0.0
+        self.kbps = 0.0
+        self.viewport = None
+
+    def add_viewer(self):
+        with self.condition:
+            self.viewers += 1
+            self.condition.notify_all()
+
+    def remove_viewer(self):
+        with self.condition:
+            self.viewers -= 1
+
+    def wait_for_frame(self, after_sequence, timeout=5):
+        """Block until a frame newer than ``after_sequence`` exists"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence > after_sequence or not self.running, timeout)
+            return self.sequence, self.frame
+
+    def capture(self):
+        params = {"format": "jpeg", "quality": self.quality, "fromSurface": True}
+        if self.scale != 1.0:
+            if self.viewport is None or self.sequence % 50 == 0:
+                metrics = execute_cdp(self.driver, "Page.getLayoutMetrics")["cssLayoutViewport"]
+                self.viewport = (metrics["clientWidth"], metrics["clientHeight"])
+            width, height = self.viewport
+            params["clip"] = {"x": 0, "y": 0, "width": width, "height": height, "scale": self.scale}
+        return base64.b64decode(execute_cdp(self.driver, "Page.captureScreenshot", params)["data"])
+
+    def adapt(self, frame_bytes, capture_seconds):
+        """Trade JPEG quality for bandwidth so frames x fps stays under the budget"""
+        interval = max(1.0 / self.max_fps, capture_seconds)
+        projected_kbps = frame_bytes * 8 / 1000 / interval
+        if projected_kbps > self.max_kbps and self.quality > self.min_quality:
+            self.quality = max(self.min_quality, self.quality - 10)
+        elif projected_kbps < self.max_kbps * 0.6 and self.quality < self.max_quality:
+            self.quality = min(self.max_quality, self.quality + 5)
+        return interval
+
+    def run(self):
+        last_digest = None
+        sent_bytes = 0
+        frames = 0
+        window_start = time.monotonic()
+
+        while self.running:
+            # Nobody watching: don't spend container CPU on encoding
+            with self.condition:
+                if not self.viewers:
+                    self.condition.wait(1.0)
+                    continue
+
+            start = time.monotonic()
+            try:
+                frame = self.capture()
+            except Exception as e:
+                log.warning(f"⚠️  Capture failed: {e}")
+                time.sleep(2)
+                continue
+            capture_seconds = time.monotonic() - start
+            interval = self.adapt(len(frame), capture_seconds)
+
+            # Unchanged page: skip the broadcast, viewers keep the last frame
+            digest = hashlib.blake2b(frame, digest_size=16).digest()
+            if digest != last_digest:
+                last_digest = digest
+                with self.condition:
+                    self.frame = frame
+                    self.sequence += 1
+                    self.condition.notify_all()
+                sent_bytes += len(frame)
+                frames += 1
+
+            elapsed = time.monotonic() - window_start
+            if elapsed >= 5:
+                self.fps = frames / elapsed
+                self.kbps = sent_bytes * 8 / 1000 / elapsed
+                sent_bytes = frames = 0
+                window_start = time.monotonic()
+
+            time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+
+def make_handler(broadcaster, session_id):
+    class ViewerHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/":
+                body = VIEWER_PAGE.replace("{session}", session_id[:8]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/stats":
+                body = json.dumps({
+                    "viewers": broadcaster.viewers,
+                    "fps": broadcaster.fps,
+                    "kbps": broadcaster.kbps,
+                    "quality": broadcaster.quality,
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/frame.jpg":
+                broadcaster.add_viewer()
+                try:
+                    _, frame = broadcaster.wait_for_frame(0)
+                finally:
+                    broadcaster.remove_viewer()
+                self.send_response(200 if frame else 503)
+                self.send_header("Content-Type", "image/jpeg")
+                self.end_headers()
+                self.wfile.write(frame or b"")
+            elif self.path == "/stream.mjpg":
+                self.stream()
+            else:
+                self.send_error(404)
+
+        def stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            # A peer that vanished without closing stalls writes instead of failing them
+            self.connection.settimeout(KEEPALIVE_SECONDS * 3)
+            broadcaster.add_viewer()
+            log.info(f"👁️  Viewer connected from {self.client_address[0]} ({broadcaster.viewers} watching)")
+            sequence = 0
+            last_write = time.monotonic()
+            try:
+                while broadcaster.running:
+                    new_sequence, frame = broadcaster.wait_for_frame(sequence)
+                    if frame is None:
+                        continue
+                    if new_sequence == sequence and time.monotonic() - last_write < KEEPALIVE_SECONDS:
+                        continue
+                    sequence = new_sequence
+                    self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                     f"Content-Length: {len(frame)}\r\n\r\n".encode())
+                    self.wfile.write(frame)
+                    self.wfile.write(b"\r\n")
+                    last_write = time.monotonic()
+            except OSError:
+                # BrokenPipeError, ConnectionResetError or a write timeout: the viewer is gone
+                pass
+            finally:
+                broadcaster.remove_viewer()
+                log.info(f"👋 Viewer left ({broadcaster.viewers} watching)")
+
+    return ViewerHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a Chrome 97 session's viewport to browsers")
+    parser.add_argument("--session", help="Session id to view (default: first session on the hub)")
+    parser.add_argument("--port", type=int, default=7901, help="HTTP port for viewers")
+    parser.add_argument("--fps", type=float, default=5, help="Maximum frames per second")
+    parser.add_argument("--kbps", type=int, default=1000, help="Target bandwidth per viewer")
+    parser.add_argument("--scale", type=float, default=1.0, help="Downscale factor, e.g. 0.5")
+    parser.add_argument("--webdriver-url", default="http://localhost:4444/wd/hub")
+    args = parser.parse_args()
+    setup_logging()
+
+    session_id = args.session
+    if not session_id:
+        try:
+            sessions = list_hub_sessions(args.webdriver_url)
+        except Exception as e:
+            log.error(f"❌ Cannot list hub sessions: {e}")
+            sys.exit(1)
+        if not sessions:
+            log.error("❌ No live sessions. Start one with run_forever.py or connect_to_frontend.py")
+            sys.exit(1)
+        session_id = sessions[0][0]
+
+    broadcaster = FrameBroadcaster(
+        attach_to_session(session_id, args.webdriver_url),
+        max_fps=args.fps, max_kbps=args.kbps, scale=args.scale
+    )
+    threading.Thread(target=broadcaster.run, name="capture", daemon=True).start()
+
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), make_handler(broadcaster, session_id))
+    server.daemon_threads = True
+    log.info(f"📺 Viewing session {session_id}")
+    log.info(f"🌐 Open http://localhost:{args.port} (max {args.fps:g} fps, ~{args.kbps} kbps)")
+    log.info("🛑 Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("\n🛑 Viewer stopped")
+    finally:
+        broadcaster.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
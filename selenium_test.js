@@ -15,7 +15,8 @@ async function createChromeOptions() {
     options.addArguments('--window-size=1920,1080');
     options.addArguments('--disable-extensions');
     options.addArguments('--disable-plugins');
-    options.addArguments('--disable-images');
+    // Chrome 97 ignores --disable-images; the content setting pref actually blocks them
+    options.setUserPreferences({ 'profile.managed_default_content_settings.images': 2 });
     return options;
 }
 
@@ -4,44 +4,43 @@ Selenium test script to access localhost:3000 from Docker container
 """
 
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 import sys
 
+import chrome_options
+
 def create_chrome_options():
     """Create Chrome options for Docker environment"""
-    options = Options()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--disable-extensions')
-    options.add_argument('--disable-plugins')
-    options.add_argument('--disable-images')
+    options = chrome_options.create_chrome_options("test")
+    # Chrome 97 ignores --disable-images; the content setting pref actually blocks them
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     return options
 
-def test_localhost_access():
-    """Test accessing localhost:3000 from Selenium container"""
+def test_localhost_access(driver=None):
+    """Test accessing localhost:3000 from Selenium container
+    
+    Pass an existing ``driver`` to reuse a pooled session (see parallel_runner.py);
+    it is left open for the caller to reset.
+    """
     print("🚀 Starting Selenium test...")
     
     # WebDriver configuration
     webdriver_url = "http://localhost:4444/wd/hub"
     target_url = "http://host.docker.internal:3000"
     
-    driver = None
+    owns_driver = driver is None
     try:
-        # Create Chrome options
-        chrome_options = create_chrome_options()
-        
-        # Connect to remote WebDriver
-        print(f"Connecting to WebDriver at {webdriver_url}...")
-        driver = webdriver.Remote(
-            command_executor=webdriver_url,
-            options=chrome_options
-        )
+        if owns_driver:
+            # Create Chrome options
+            options = create_chrome_options()
+            
+            # Connect to remote WebDriver
+            print(f"Connecting to WebDriver at {webdriver_url}...")
+            driver = webdriver.Remote(
+                command_executor=webdriver_url,
+                options=options
+            )
         
         print(f"Navigating to {target_url}...")
         driver.get(target_url)
@@ -75,7 +74,7 @@ def test_localhost_access():
         return False
         
     finally:
-        if driver:
+        if driver and owns_driver:
             driver.quit()
             print("WebDriver session closed")
 
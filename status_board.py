@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Shared-memory status board - every run_forever.py instance publishes its live state
+"""
+
+# Standard library only: `chrome97.py status` imports this and must stay fast.
+#
+# Layout (little-endian, fixed size so readers never parse or allocate much):
+#   header  64 bytes  magic "C97S", version u16, slot count u16, zero padding
+#   slot    296 bytes x MAX_SLOTS, see SLOT below
+#
+# Each slot has exactly one writer (the process that claimed it). Writers bump
+# ``seq`` to odd before changing the slot and back to even afterwards; readers
+# retry while ``seq`` is odd or changes under them (a seqlock), so no reader
+# ever blocks a writer.
+import fcntl
+import struct
+import mmap
+import time
+import os
+
+STATUS_FILE = os.environ.get("CHROME97_STATUS_FILE") or (
+    "/dev/shm/chrome97-status" if os.path.isdir("/dev/shm") else "/tmp/chrome97-status"
+)
+
+MAGIC = b"C97S"
+VERSION = 1
+MAX_SLOTS = 64
+HEADER = struct.Struct("<4sHH56x")
+SLOT = struct.Struct(
+    "<I"     # seq (odd while being written)
+    "I"      # pid
+    "H"      # port
+    "B"      # state, see STATES
+    "x"
+    "d"      # started_at (epoch seconds)
+    "d"      # updated_at (epoch seconds)
+    "f"      # last_probe_ms (-1 = not probed yet)
+    "I"      # recoveries
+    "I"      # health_failures
+    "64s"    # session_id
+    "192s"   # url
+)
+FILE_SIZE = HEADER.size + SLOT.size * MAX_SLOTS
+
+STATES = ("empty", "starting", "connecting", "connected", "recovering", "stopped")
+
+# A live instance heartbeats every loop and while it waits between connection
+# attempts; older than this it is reported stale. One blocking WebDriver call
+# can take minutes (a new-session request queued at a busy hub), hence the margin.
+STALE_SECONDS = 180
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _text(raw):
+    return raw.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+
+class StatusPublisher:
+    """Owns one slot of the status board for the lifetime of a process"""
+
+    def __init__(self, port, path=STATUS_FILE):
+        self.path = path
+        self.fields = {
+            "pid": os.getpid(),
+            "port": port,
+            "state": "starting",
+            "started_at": time.time(),
+            "last_probe_ms": -1.0,
+            "recoveries": 0,
+            "health_failures": 0,
+            "session_id": "",
+            "url": "",
+        }
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Creating/growing the file and claiming a slot must not race other instances
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < FILE_SIZE:
+                os.ftruncate(fd, FILE_SIZE)
+            self.map = mmap.mmap(fd, FILE_SIZE)
+            magic, version, _ = HEADER.unpack_from(self.map, 0)
+            if magic != MAGIC or version != VERSION:
+                self.map[:FILE_SIZE] = bytes(FILE_SIZE)
+                HEADER.pack_into(self.map, 0, MAGIC, VERSION, MAX_SLOTS)
+            self.offset = HEADER.size + SLOT.size * self._claim_slot()
+            self.seq = SLOT.unpack_from(self.map, self.offset)[0] & ~1
+            # Write our pid before unlocking, or the next instance sees the slot free too
+            self._write()
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _claim_slot(self):
+        """First slot that is empty, stopped, or whose owner process is gone"""
+        for index in range(MAX_SLOTS):
+            _, pid, _, state, *_ = SLOT.unpack_from(self.map, HEADER.size + SLOT.size * index)
+            if pid == 0 or STATES[state] in ("empty", "stopped") or not _pid_alive(pid):
+                return index
+        raise RuntimeError(f"Status board full ({MAX_SLOTS} instances) at {self.path}")
+
+    def _write(self):
+        f = self.fields
+        self.seq += 1
+        struct.pack_into("<I", self.map, self.offset, self.seq)
+        SLOT.pack_into(
+            self.map, self.offset, self.seq, f["pid"], f["port"], STATES.index(f["state"]),
+            f["started_at"], time.time(), f["last_probe_ms"], f["recoveries"], f["health_failures"],
+            f["session_id"].encode()[:64], f["url"].encode()[:192],
+        )
+        self.seq += 1
+        struct.pack_into("<I", self.map, self.offset, self.seq)
+
+    def publish(self, **fields):
+        """Update any of the slot's fields (also serves as a heartbeat)"""
+        self.fields.update(fields)
+        self._write()
+
+    def close(self):
+        self.publish(state="stopped")
+        self.map.close()
+
+
+def read_board(path=STATUS_FILE):
+    """Snapshot every occupied slot without locking; returns a list of dicts"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    try:
+        if os.fstat(fd).st_size < FILE_SIZE:
+            return []
+        board = mmap.mmap(fd, FILE_SIZE, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+    try:
+        magic, version, _ = HEADER.unpack_from(board, 0)
+        if magic != MAGIC or version != VERSION:
+            return []
+
+        now = time.time()
+        instances = []
+        for index in range(MAX_SLOTS):
+            offset = HEADER.size + SLOT.size * index
+            for _ in range(100):
+                values = SLOT.unpack_from(board, offset)
+                if values[0] % 2 == 0 and struct.unpack_from("<I", board, offset)[0] == values[0]:
+                    break
+            else:
+                continue  # writer stuck mid-update; skip this slot for this snapshot
+            (_, pid, port, state, started_at, updated_at, probe_ms,
+             recoveries, failures, session_id, url) = values
+            if pid == 0:
+                continue
+            state = STATES[state] if state < len(STATES) else "empty"
+            if state != "stopped" and (not _pid_alive(pid) or now - updated_at > STALE_SECONDS):
+                state = "stale"
+            instances.append({
+                "slot": index,
+                "pid": pid,
+                "port": port,
+                "state": state,
+                "uptime_s": int(now - started_at),
+                "updated_s_ago": round(now - updated_at, 1),
+                "last_probe_ms": round(probe_ms, 1) if probe_ms >= 0 else None,
+                "recoveries": recoveries,
+                "health_failures": failures,
+                "session_id": _text(session_id),
+                "url": _text(url),
+            })
+        return instances
+    finally:
+        board.close()
+
+
+def format_uptime(seconds):
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}h {rest // 60}m"
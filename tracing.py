@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Lightweight span tracing for the Chrome 97 harness, exported as Chrome trace-event JSON
+"""
+
+# Open the trace file in chrome://tracing or https://ui.perfetto.dev to see a
+# recovery as a flame chart. Spans are written as they finish, so a trace from
+# a process that never exits is still readable: the trace-event format allows
+# the closing "]" to be missing.
+from contextlib import contextmanager
+import threading
+import functools
+import atexit
+import itertools
+import json
+import time
+import sys
+import os
+
+_tracer = None
+_ids = itertools.count(1)
+_local = threading.local()
+
+
+class Span:
+    """One timed operation; ``set`` adds attributes while it runs"""
+
+    __slots__ = ("name", "span_id", "parent_id", "start_us", "attrs")
+
+    def __init__(self, name, parent_id, attrs):
+        self.name = name
+        self.span_id = next(_ids)
+        self.parent_id = parent_id
+        self.start_us = time.monotonic_ns() // 1000
+        self.attrs = attrs
+
+    def set(self, key, value):
+        self.attrs[key] = value
+
+
+class _NoopSpan:
+    def set(self, key, value):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class TraceWriter:
+    """Streams complete ("X") trace events to a JSON array file"""
+
+    def __init__(self, path, process_name):
+        self.path = path
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.span_count = 0
+        self._write({"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                     "args": {"name": process_name}})
+        self.thread_names = set()
+
+    def _write(self, event):
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(json.dumps(event, default=str) + ",\n")
+            self.file.flush()
+
+    def write_span(self, span, end_us):
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names.add(tid)
+            self._write({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                         "args": {"name": threading.current_thread().name}})
+        args = dict(span.attrs, span_id=span.span_id)
+        if span.parent_id:
+            args["parent_id"] = span.parent_id
+        self._write({"name": span.name, "cat": "harness", "ph": "X", "ts": span.start_us,
+                     "dur": end_us - span.start_us, "pid": self.pid, "tid": tid, "args": args})
+        self.span_count += 1
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            # A trailing empty metadata event keeps the array valid after the last comma
+            self.file.write(json.dumps({"name": "trace_end", "ph": "M", "pid": self.pid, "tid": 0,
+                                        "args": {}}) + "\n]\n")
+            self.file.close()
+
+
+def setup_tracing(path=None, process_name=None):
+    """Start writing spans to ``path`` (or $CHROME97_TRACE_FILE); no path = tracing off"""
+    global _tracer
+    path = path or os.environ.get("CHROME97_TRACE_FILE")
+    if not path:
+        return None
+    shutdown_tracing()
+    _tracer = TraceWriter(path, process_name or os.path.basename(sys.argv[0]))
+    atexit.register(shutdown_tracing)
+    return _tracer
+
+
+def shutdown_tracing():
+    global _tracer
+    if _tracer:
+        _tracer.close()
+        _tracer = None
+
+
+def current_span():
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else NOOP_SPAN
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as a child of the current span (free when tracing is off)"""
+    if _tracer is None:
+        yield NOOP_SPAN
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    s = Span(name, stack[-1].span_id if stack else None, attrs)
+    stack.append(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.set("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        stack.pop()
+        writer = _tracer
+        if writer:
+            writer.write_span(s, time.monotonic_ns() // 1000)
+
+
+def traced(name=None):
+    """Decorator form of ``span``; records simple return values as ``result``"""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name) as s:
+                result = func(*args, **kwargs)
+                if isinstance(result, (bool, int, float, str)):
+                    s.set("result", result)
+                return result
+        return wrapper
+    return decorate
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Warm Chrome 97 profile - reuses one user-data-dir and HTTP cache across sessions
+"""
+
+import subprocess
+import argparse
+import shlex
+import re
+import os
+
+from harness_log import get_logger, setup_logging
+
+log = get_logger("warm_profile")
+
+# /dev/shm is a tmpfs bind-mounted into the container (see docker-compose.yml),
+# so the profile is RAM-backed and survives container restarts
+PROFILE_ROOT = "/dev/shm/chrome97-profiles"
+# Set CHROME97_SERVICE=selenium-chrome-headless when running the headless node
+CONTAINER_SERVICE = os.environ.get("CHROME97_SERVICE", "selenium-chrome")
+
+PROFILE_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+# Session errors that point at the profile itself rather than the hub or node
+PROFILE_ERROR_HINTS = ("user data directory", "user-data-dir", "devtoolsactiveport",
+                       "chrome failed to start", "crashed")
+
+
+def profile_name(value):
+    """argparse type for profile names (they end up in container shell commands)"""
+    if not PROFILE_NAME.fullmatch(value):
+        raise argparse.ArgumentTypeError(f"invalid profile name '{value}' (use letters, digits, '_' and '-')")
+    return value
+
+
+def container_exec(command, timeout=30):
+    """Run a shell command inside the Selenium container, returning (exit code, stdout)"""
+    result = subprocess.run(
+        ["docker-compose", "exec", "-T", CONTAINER_SERVICE, "sh", "-c", command],
+        capture_output=True, text=True, timeout=timeout
+    )
+    return result.returncode, result.stdout.strip()
+
+
+class WarmProfile:
+    """A named, size-capped Chrome profile directory inside the container"""
+
+    def __init__(self, name="default", cache_size_mb=256, max_profile_mb=512, root=PROFILE_ROOT):
+        if not PROFILE_NAME.fullmatch(name):
+            raise ValueError(f"Invalid profile name '{name}' (use letters, digits, '_' and '-')")
+        self.name = name
+        self.cache_size_mb = cache_size_mb
+        self.max_profile_mb = max_profile_mb
+        self.root = root
+        self.resets = 0
+        self.profile_failures = 0
+
+    @property
+    def path(self):
+        return f"{self.root}/{self.name}"
+
+    def apply(self, options):
+        """Point Chrome options at the persistent profile and capped disk cache"""
+        options.add_argument(f'--user-data-dir={self.path}')
+        options.add_argument(f'--disk-cache-dir={self.path}/cache')
+        options.add_argument(f'--disk-cache-size={self.cache_size_mb * 1024 * 1024}')
+        return options
+
+    def size_mb(self):
+        """Current on-disk size of the profile, or None if it cannot be read"""
+        try:
+            code, output = container_exec(f"du -sk {shlex.quote(self.path)} 2>/dev/null | cut -f1")
+        except Exception:
+            return None
+        if code != 0 or not output.isdigit():
+            return 0 if code == 0 else None
+        return int(output) / 1024
+
+    def reset(self, reason):
+        """Throw the profile away so the next session starts from a fresh directory"""
+        log.info(f"🧹 Resetting warm profile '{self.name}' ({reason})",
+                 extra={"event": "profile_reset", "profile": self.name, "reason": reason})
+        try:
+            container_exec(f"rm -rf {shlex.quote(self.path)}")
+        except Exception as e:
+            log.warning(f"⚠️  Could not remove {self.path}: {e}")
+        self.resets += 1
+
+    def prepare(self):
+        """Enforce the size cap before a new session opens the profile"""
+        size = self.size_mb()
+        if size is not None and size > self.max_profile_mb:
+            self.reset(f"{size:.0f}MB exceeds {self.max_profile_mb}MB cap")
+
+    def in_use(self):
+        """Whether a Chrome process in the container still has this profile open"""
+        try:
+            # "[-]" keeps the pattern from matching the sh -c running pgrep itself
+            code, _ = container_exec(f"pgrep -f -- {shlex.quote('[-]-user-data-dir=' + self.path)}")
+        except Exception:
+            return True  # can't tell: assume it is, and leave the files alone
+        return code == 0
+
+    def started(self):
+        """Called once a session came up on this profile"""
+        self.profile_failures = 0
+
+    def recover(self, error):
+        """Called when a session using this profile failed to start
+
+        Busy slots, queue timeouts and an unreachable hub say nothing about the
+        profile, so the cache is kept. A profile error first gets its stale
+        Singleton* locks (left by a killed browser) removed; only a second
+        profile error in a row throws the whole profile away.
+        """
+        message = str(error).lower()
+        if not any(hint in message for hint in PROFILE_ERROR_HINTS):
+            return
+        if self.in_use():
+            log.info(f"⏳ Warm profile '{self.name}' is still open in another Chrome, leaving it alone")
+            return
+
+        self.profile_failures += 1
+        if self.profile_failures == 1:
+            log.info(f"🔓 Removing stale locks from warm profile '{self.name}'",
+                     extra={"event": "profile_unlock", "profile": self.name})
+            try:
+                path = shlex.quote(self.path)
+                container_exec(f"rm -f {path}/SingletonLock {path}/SingletonSocket {path}/SingletonCookie")
+            except Exception as e:
+                log.warning(f"⚠️  Could not remove locks in {self.path}: {e}")
+        else:
+            self.reset("session failed to start twice with this profile")
+            self.profile_failures = 0
+
+
+def measure_page_load(driver, url):
+    """Load a URL and return (navigation ms, bytes transferred over the network)"""
+    driver.get(url)
+    timing = driver.execute_script("""
+        var t = performance.timing;
+        var transferred = performance.getEntriesByType('resource').reduce(function (sum, r) {
+            return sum + (r.transferSize || 0);
+        }, 0);
+        var nav = performance.getEntriesByType('navigation')[0];
+        return {
+            loadMs: t.loadEventEnd - t.navigationStart,
+            bytes: transferred + (nav ? nav.transferSize : 0)
+        };
+    """)
+    return timing["loadMs"], timing["bytes"]
+
+
+def benchmark(port=3000, runs=5):
+    """Compare page load time after reconnect with a fresh profile vs the warm profile"""
+    from chrome_options import create_chrome_options
+    from cdp import create_remote_driver
+
+    url = f"http://host.docker.internal:{port}"
+    profile = WarmProfile(name="benchmark")
+
+    def load_once():
+        options = profile.apply(create_chrome_options("test"))
+        driver = create_remote_driver(options)
+        try:
+            return measure_page_load(driver, url)
+        finally:
+            driver.quit()
+
+    results = {"cold": [], "warm": []}
+
+    print(f"🧊 Cold: fresh profile for each of {runs} sessions...")
+    for run in range(runs):
+        profile.reset("cold run")
+        results["cold"].append(load_once())
+
+    print(f"🔥 Warm: one priming session, then {runs} sessions on the same profile...")
+    profile.reset("warm start")
+    load_once()
+    for run in range(runs):
+        results["warm"].append(load_once())
+
+    profile.reset("benchmark done")
+
+    print("📊 Page load after reconnect:")
+    for mode, samples in results.items():
+        avg_ms = sum(s[0] for s in samples) / len(samples)
+        avg_kb = sum(s[1] for s in samples) / len(samples) / 1024
+        print(f"   {mode}: avg {avg_ms:.0f}ms, {avg_kb:.1f} KB transferred over {len(samples)} runs")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage and benchmark warm Chrome 97 profiles")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="Cold vs warm page load after reconnect")
+    bench.add_argument("port", nargs="?", type=int, default=3000)
+    bench.add_argument("--runs", type=int, default=5)
+
+    for name in ("size", "reset"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("name", nargs="?", default="default", type=profile_name, help="Profile name")
+
+    args = parser.parse_args()
+    setup_logging()
+    if args.command == "bench":
+        benchmark(args.port, args.runs)
+    elif args.command == "size":
+        size = WarmProfile(args.name).size_mb()
+        print(f"📦 Profile '{args.name}': {'unknown' if size is None else f'{size:.1f}MB'}")
+    elif args.command == "reset":
+        WarmProfile(args.name).reset("requested")
+
+
+if __name__ == "__main__":
+    main()